@@ -1,19 +1,52 @@
 
+import abc
+import argparse
+import bisect
+import concurrent.futures
+import contextlib
+import heapq
+import itertools
+import json
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
 import threading
 import time
 import random
+import re
 import sys
-import tkinter as tk
-from tkinter import ttk
-from tkinter import scrolledtext, messagebox
+import tempfile
+from array import array
+from collections import Counter
+from multiprocessing import shared_memory
 
-# External dependency:
+# External dependency, imported on first use so the engine and the CLI work
+# on machines without a display:
 #   pip install pynput
-try:
-    from pynput.keyboard import Controller, Key
-except Exception as e:
-    Controller = None
-    Key = None
+Controller = None
+Key = None
+KeyCode = None
+
+def load_pynput() -> bool:
+    """Import pynput on demand; return whether it is usable."""
+    global Controller, Key, KeyCode
+    if Controller is None:
+        try:
+            from pynput.keyboard import Controller, Key, KeyCode
+        except Exception:
+            return False
+    return True
+
+# Optional dependency, imported on first use:
+#   pip install numpy
+def load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("NumPy is not available. Please install it with 'pip install numpy'.")
+    return numpy
 
 # ---------------------------
 # Typing utilities & models
@@ -72,19 +105,858 @@ def keep_case(src_char: str, neighbor: str) -> str:
         return neighbor.upper()
     return neighbor
 
-def adjacent_key(char: str) -> str:
+def adjacent_key(char: str, rng=random) -> str:
     base = char.lower()
     if base in QWERTY_NEIGHBORS and QWERTY_NEIGHBORS[base]:
-        return keep_case(char, random.choice(QWERTY_NEIGHBORS[base]))
+        return keep_case(char, rng.choice(QWERTY_NEIGHBORS[base]))
     # Fallback random letter
     pool = "abcdefghijklmnopqrstuvwxyz"
-    return random.choice(pool).upper() if char.isupper() else random.choice(pool)
+    return rng.choice(pool).upper() if char.isupper() else rng.choice(pool)
 
 def secs_per_char_for_wpm(wpm: float) -> float:
     # 5 chars per word heuristic
     # delay per char = 60 / (wpm*5) = 12 / wpm
     return 12.0 / max(wpm, 1.0)
 
+def normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+# Characters read per chunk when streaming
+CHUNK_SIZE = 1 << 16
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE, short=None):
+    """Yield newline-normalized chunks of ``source`` (a str or text file).
+
+    A trailing "\r" is held back until the next chunk so a "\r\n" split
+    across chunks still becomes a single "\n". With ``short`` set, that
+    object is yielded after every read that came back short of ``chunk_size``,
+    i.e. whenever a stream has no more input ready.
+    """
+    if isinstance(source, str):
+        raw = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    else:
+        read = source.read
+        seekable = getattr(source, "seekable", None)
+        if seekable is not None and not seekable():
+            # Pipes and terminals: take input a line at a time as it arrives
+            read = getattr(source, "readline", read)
+        raw = iter(lambda: read(chunk_size), "")
+    pending_cr = False
+    for chunk in raw:
+        is_short = short is not None and len(chunk) < chunk_size
+        if pending_cr:
+            chunk = "\r" + chunk
+        pending_cr = chunk.endswith("\r")
+        if pending_cr:
+            chunk = chunk[:-1]
+        if chunk:
+            yield normalize_newlines(chunk)
+        if is_short:
+            yield short
+    if pending_cr:
+        yield "\n"
+
+# For str patterns \w is exactly str.isalnum() plus "_"
+TOKEN_RE = re.compile(r"[\w']+|.", re.DOTALL)
+
+def _is_run(token: str) -> bool:
+    # Tokens are either word runs or single other characters
+    first = token[0]
+    return first.isalnum() or first in ("'", "_")
+
+def iter_tokens(source, chunk_size=CHUNK_SIZE, short=None):
+    """Lazily split ``source`` (a str or text file) into tokens.
+
+    Runs of alphanumerics (plus ' and _) form words, every other character is
+    its own token. Words spanning chunk boundaries are joined; memory use is
+    bounded by the chunk size and the longest word. ``short`` is passed
+    through from iter_chunks(); a word still open at a short read is held
+    back until it ends.
+    """
+    findall = TOKEN_RE.findall
+    parts = []  # pieces of a word run left open by the previous chunk(s)
+    for chunk in iter_chunks(source, chunk_size, short):
+        if chunk is short:
+            yield short
+            continue
+        tokens = findall(chunk)
+        if parts:
+            if _is_run(tokens[0]):
+                parts.append(tokens[0])
+                if len(tokens) == 1:
+                    continue
+                tokens[0] = "".join(parts)
+            else:
+                yield "".join(parts)
+            parts = []
+        if _is_run(tokens[-1]):
+            parts = [tokens.pop()]
+        yield from tokens
+    if parts:
+        yield "".join(parts)
+
+# Marks a short read in a token stream (see iter_chunks)
+_READ_SHORT = object()
+
+def _token_batches(tokens, size: int):
+    # Lists of up to ``size`` tokens; a _READ_SHORT ends a batch early
+    batch = []
+    for token in tokens:
+        if token is _READ_SHORT:
+            if batch:
+                yield batch
+                batch = []
+            continue
+        batch.append(token)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(normalize_newlines(text))
+
+def is_word(token: str) -> bool:
+    return token.isalnum() or ("'" in token and token.replace("'", "").isalnum())
+
+# ---------------------------
+# Keystroke plans
+# ---------------------------
+
+# Action kinds stored in KeystrokePlan.kinds
+ACTION_TYPE = 0
+ACTION_BACKSPACE = 1
+ACTION_ENTER = 2
+
+BACKSPACE_DELAY = 0.045
+
+class KeystrokePlan:
+    """Precomputed keystrokes as parallel columns.
+
+    ``kinds[i]`` is one of the ACTION_* constants, ``codes[i]`` the Unicode
+    code point to type (0 for Backspace) and ``delays[i]`` the seconds to wait
+    after the action. Pauses are folded into the delay of the preceding key.
+
+    Token bookkeeping maps actions back to the source: ``token_ends[k]`` is the
+    action index just past token k and ``token_chars[k]`` the source characters
+    covered through token k, both counted from ``first_token``/``first_char``.
+    """
+
+    def __init__(self, first_token=0, first_char=0):
+        self.kinds = array("B")
+        self.codes = array("I")
+        self.delays = array("d")
+        self.token_ends = array("I")
+        self.token_chars = array("I")
+        self.first_token = first_token
+        self.first_char = first_char
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.codes, self.delays)
+
+    def add(self, kind: int, code: int, delay: float):
+        self.kinds.append(kind)
+        self.codes.append(code)
+        self.delays.append(delay)
+
+    def add_pause(self, seconds: float):
+        # Nothing typed yet means nothing to wait after
+        if seconds and self.delays:
+            self.delays[-1] += seconds
+
+    def end_token(self, n_chars: int):
+        """Mark the actions added so far as finishing a token of ``n_chars``."""
+        chars = self.token_chars[-1] if self.token_chars else 0
+        self.token_ends.append(len(self.kinds))
+        self.token_chars.append(chars + n_chars)
+
+    def extend(self, other: "KeystrokePlan"):
+        actions = len(self.kinds)
+        chars = self.token_chars[-1] if self.token_chars else 0
+        self.kinds.extend(other.kinds)
+        self.codes.extend(other.codes)
+        self.delays.extend(other.delays)
+        self.token_ends.extend(end + actions for end in other.token_ends)
+        self.token_chars.extend(c + chars for c in other.token_chars)
+
+    @property
+    def duration(self) -> float:
+        return sum(self.delays)
+
+    def count(self, kind: int) -> int:
+        return self.kinds.count(kind)
+
+    def to_numpy(self):
+        """Zero-copy NumPy views of (kinds, codes, delays)."""
+        np = load_numpy()
+        return (np.frombuffer(self.kinds, dtype=np.uint8),
+                np.frombuffer(self.codes, dtype=np.dtype("u%d" % self.codes.itemsize)),
+                np.frombuffer(self.delays, dtype=np.float64))
+
+# ---------------------------
+# Output verification
+# ---------------------------
+
+class PlanMismatchError(RuntimeError):
+    """A plan's net output differs from the text it was planned for."""
+
+    def __init__(self, expected: str, actual: str):
+        pos = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                   min(len(expected), len(actual)))
+        super().__init__(f"plan output differs from the input at character {pos}: "
+                         f"expected {expected[pos:pos + 20]!r}, got {actual[pos:pos + 20]!r}")
+        self.expected = expected
+        self.actual = actual
+        self.position = pos
+
+class EditorBuffer:
+    """Models a text field: plans only ever type at the cursor, so keys insert
+    and delete at the end of an array in O(1)."""
+
+    def __init__(self, capacity=64):
+        self.buf = array("I", [0]) * capacity
+        self.cursor = 0
+
+    def __len__(self):
+        return self.cursor
+
+    def apply(self, plan: KeystrokePlan):
+        """Replay a plan's keystrokes at the cursor."""
+        buf = self.buf
+        pos = self.cursor
+        for kind, code in zip(plan.kinds, plan.codes):
+            if kind == ACTION_BACKSPACE:
+                if pos > 0:
+                    pos -= 1
+            else:
+                if pos == len(buf):
+                    buf.extend(array("I", [0]) * (len(buf) or 64))
+                buf[pos] = code
+                pos += 1
+        self.cursor = pos
+
+    def text(self) -> str:
+        return "".join(map(chr, self.buf[:self.cursor]))
+
+def verify_plan(plan: KeystrokePlan, expected: str):
+    """Raise PlanMismatchError unless typing ``plan`` into an empty field
+    leaves exactly ``expected``."""
+    editor = EditorBuffer(len(expected) + 16)
+    editor.apply(plan)
+    actual = editor.text()
+    if actual != expected:
+        raise PlanMismatchError(expected, actual)
+
+# ---------------------------
+# Keyboard backends
+# ---------------------------
+
+# Characters of the text are one-character keys; keys without a character
+# of their own are named, so no character in the text (a "\b" in a captured
+# log, say) can ever be taken for one of them
+KEY_BACKSPACE = "<backspace>"
+KEY_SHIFT = "<shift>"
+KEY_ENTER = "\n"  # newlines in the text are typed with Enter
+
+class KeyboardBackend(abc.ABC):
+    """Destination for keystrokes.
+
+    Subclasses implement press()/release(); type() and backspace() are the
+    entry points the executor uses and may be overridden with faster paths.
+
+    With a ``layout`` (the set of characters typed with Shift) Shift is
+    held across a run of characters that need it, like a typist would: it is
+    pressed before the first, released before the next character or key that
+    does not, and released by release_modifiers() and close().
+    """
+
+    layout = None
+    shift_down = False
+
+    @abc.abstractmethod
+    def press(self, key: str):
+        ...
+
+    @abc.abstractmethod
+    def release(self, key: str):
+        ...
+
+    def set_shift(self, down: bool):
+        (self.press if down else self.release)(KEY_SHIFT)
+        self.shift_down = down
+
+    def release_modifiers(self):
+        if self.shift_down:
+            self.set_shift(False)
+
+    def key_down(self, ch: str):
+        if self.layout is not None and (ch in self.layout) is not self.shift_down:
+            self.set_shift(not self.shift_down)
+        self.press(ch)
+
+    def key_up(self, ch: str):
+        self.release(ch)
+
+    def type(self, ch: str):
+        self.key_down(ch)
+        self.release(ch)
+
+    def backspace(self):
+        if self.shift_down:
+            self.set_shift(False)
+        self.press(KEY_BACKSPACE)
+        self.release(KEY_BACKSPACE)
+
+    def close(self):
+        self.release_modifiers()
+
+class PynputBackend(KeyboardBackend):
+    """Injects real OS key events through pynput.
+
+    Each character is resolved to a pynput key code once and cached together
+    with whether ``layout`` (the set of characters typed with Shift) types it
+    with Shift. type() and backspace() send the cached key code
+    straight to the platform emitter, skipping Controller.press()'s per-call
+    key resolution, modifier bookkeeping and dead-key handling.
+
+    Holding Shift across runs only pays off where pynput's emitter wraps
+    every shifted character in a Shift press/release of its own (uinput on
+    Linux); the keymap it loads then tells which characters need Shift. The
+    X11, Windows and macOS emitters inject such characters as single events
+    and apply a held Shift to every key whatever the local layout, so by
+    default no Shift is held there. ``layout`` forces a set of shifted
+    characters; ``shift_runs=False`` never holds Shift.
+
+    Shift itself goes through the controller, so the emitter sees it as held
+    for the whole run of shifted characters.
+    """
+
+    def __init__(self, layout=None, shift_runs=True):
+        if not load_pynput():
+            raise RuntimeError("pynput is not available. Please install it with 'pip install pynput'.")
+        self.controller = Controller()
+        self.layout = layout if shift_runs else None
+        keymap = getattr(self.controller, "_layout", None)
+        self._keymap = keymap if shift_runs and hasattr(keymap, "for_char") else None
+        self._keys = {KEY_BACKSPACE: Key.backspace, KEY_ENTER: Key.enter, KEY_SHIFT: Key.shift,
+                      "\t": Key.tab}
+        self._cache = {}
+        # Platform hook behind Controller.press/release; fall back to those
+        handle = getattr(self.controller, "_handle", None)
+        if handle is None:
+            def handle(key, is_press):
+                (self.controller.press if is_press else self.controller.release)(key)
+        self._handle = handle
+
+    def resolve(self, ch: str) -> tuple:
+        """Return (key code, needs shift) for ``ch``, cached."""
+        entry = self._cache.get(ch)
+        if entry is None:
+            special = self._keys.get(ch)
+            if special is not None:
+                entry = (special.value, False)
+            else:
+                entry = (KeyCode.from_char(ch), self._needs_shift(ch))
+            self._cache[ch] = entry
+        return entry
+
+    def _needs_shift(self, ch: str) -> bool:
+        if self.layout is not None:
+            return ch in self.layout
+        if self._keymap is not None:
+            try:
+                return Key.shift in self._keymap.for_char(ch)[1]
+            except KeyError:
+                pass
+        return False
+
+    # Modifiers go through the controller so that it tracks their state
+    def press(self, key: str):
+        self.controller.press(self.resolve(key)[0])
+
+    def release(self, key: str):
+        self.controller.release(self.resolve(key)[0])
+
+    def set_shift(self, down: bool):
+        (self.controller.press if down else self.controller.release)(Key.shift)
+        self.shift_down = down
+
+    def key_down(self, ch: str):
+        code, shifted = self.resolve(ch)
+        if shifted is not self.shift_down:
+            self.set_shift(shifted)
+        self._handle(code, True)
+
+    def key_up(self, ch: str):
+        self._handle(self.resolve(ch)[0], False)
+
+    def type(self, ch: str):
+        code, shifted = self.resolve(ch)
+        if shifted is not self.shift_down:
+            self.set_shift(shifted)
+        handle = self._handle
+        handle(code, True)
+        handle(code, False)
+
+    def backspace(self):
+        self.type(KEY_BACKSPACE)
+
+class NullBackend(KeyboardBackend):
+    """Discards every key; measures the engine without OS injection cost."""
+
+    def press(self, key: str):
+        pass
+
+    def release(self, key: str):
+        pass
+
+    def key_down(self, ch: str):
+        pass
+
+    def key_up(self, ch: str):
+        pass
+
+    def type(self, ch: str):
+        pass
+
+    def backspace(self):
+        pass
+
+# RecordingBackend event kinds
+EVENT_PRESS = 0
+EVENT_RELEASE = 1
+
+# RecordingBackend stores named keys past the last Unicode code point
+_NAMED_KEY_CODES = {KEY_BACKSPACE: 0x110000, KEY_SHIFT: 0x110001}
+_NAMED_KEYS = {code: key for key, code in _NAMED_KEY_CODES.items()}
+
+class RecordingBackend(KeyboardBackend):
+    """Records timestamped press/release events into a preallocated ring buffer.
+
+    Once ``capacity`` events have been recorded the oldest are overwritten;
+    ``total`` keeps counting so callers can tell how many were dropped. Pass a
+    ``layout`` to also record the Shift presses a real keyboard would need.
+    """
+
+    def __init__(self, capacity=1 << 16, clock=time.perf_counter_ns, layout=None):
+        self.capacity = capacity
+        self.clock = clock
+        self.layout = layout
+        self.times = array("q", [0]) * capacity
+        self.kinds = array("B", [0]) * capacity
+        self.keys = array("I", [0]) * capacity
+        self.total = 0
+
+    def press(self, key: str):
+        i = self.total % self.capacity
+        self.times[i] = self.clock()
+        self.kinds[i] = EVENT_PRESS
+        self.keys[i] = _NAMED_KEY_CODES[key] if len(key) > 1 else ord(key)
+        self.total += 1
+
+    def release(self, key: str):
+        i = self.total % self.capacity
+        self.times[i] = self.clock()
+        self.kinds[i] = EVENT_RELEASE
+        self.keys[i] = _NAMED_KEY_CODES[key] if len(key) > 1 else ord(key)
+        self.total += 1
+
+    def clear(self):
+        self.total = 0
+
+    def events(self) -> list:
+        """Retained events, oldest first, as (time_ns, kind, key) tuples."""
+        n = min(self.total, self.capacity)
+        first = self.total - n
+        out = []
+        for j in range(first, self.total):
+            i = j % self.capacity
+            code = self.keys[i]
+            out.append((self.times[i], self.kinds[i], _NAMED_KEYS.get(code) or chr(code)))
+        return out
+
+BACKENDS = {
+    "pynput": PynputBackend,
+    "null": NullBackend,
+    "recording": RecordingBackend,
+}
+
+def default_backend():
+    """The pynput backend when it can be loaded, else None."""
+    return PynputBackend() if load_pynput() else None
+
+# ---------------------------
+# Scheduling
+# ---------------------------
+
+class RealClock:
+    """perf_counter_ns time with interruptible waits.
+
+    With ``spin_threshold`` set (seconds), waits sleep coarsely until that
+    long before the deadline and then yield-spin until it passes. This trades
+    CPU for accuracy; ``spin_ns`` accumulates the time spent spinning.
+    """
+
+    def __init__(self, spin_threshold=None):
+        self.spin_threshold_ns = None if spin_threshold is None else int(spin_threshold * 1e9)
+        self.spin_ns = 0
+
+    def now_ns(self) -> int:
+        return time.perf_counter_ns()
+
+    def sleep_until(self, deadline_ns: int, wake_event: threading.Event) -> bool:
+        """Block until ``deadline_ns``. Return False if woken early by ``wake_event``."""
+        now = time.perf_counter_ns()
+        spin = self.spin_threshold_ns
+        if spin is None:
+            if deadline_ns <= now:
+                return not wake_event.is_set()
+            return not wake_event.wait((deadline_ns - now) / 1e9)
+        coarse = deadline_ns - spin - now
+        if coarse > 0 and wake_event.wait(coarse / 1e9):
+            return False
+        spin_start = time.perf_counter_ns()
+        now = spin_start
+        while now < deadline_ns:
+            if wake_event.is_set():
+                break
+            time.sleep(0)  # yield the CPU/GIL between checks
+            now = time.perf_counter_ns()
+        self.spin_ns += now - spin_start
+        return now >= deadline_ns
+
+class VirtualClock:
+    """Simulated time: waits advance the clock and return immediately.
+
+    Running a plan against a VirtualClock replays its exact timeline at CPU
+    speed, e.g. to see how long a document takes under a preset.
+    """
+
+    def __init__(self, start_ns=0):
+        self.t_ns = start_ns
+        self.spin_ns = 0
+
+    def now_ns(self) -> int:
+        return self.t_ns
+
+    def sleep_until(self, deadline_ns: int, wake_event: threading.Event) -> bool:
+        if wake_event.is_set():
+            return False
+        if deadline_ns > self.t_ns:
+            self.t_ns = deadline_ns
+        return True
+
+class DeadlineScheduler:
+    """Paces keystrokes against absolute deadlines.
+
+    Each wait targets ``origin + sum(delays so far)`` on ``clock``, so time
+    spent injecting keys and oversleeping is absorbed by the next wait instead
+    of accumulating over the run. If the machine stalls and we fall more than
+    ``max_lag`` seconds behind, the schedule is rebased to "now" rather than
+    firing a burst of catch-up keys.
+
+    Every wait blocks on ``wake_event`` rather than time.sleep, so setting it
+    cuts the current wait short within milliseconds.
+    """
+
+    def __init__(self, clock=None, max_lag=0.5, wake_event=None):
+        self.clock = clock if clock is not None else RealClock()
+        self.wake_event = wake_event if wake_event is not None else threading.Event()
+        self.max_lag_ns = None if max_lag is None else int(max_lag * 1e9)
+        self.origin_ns = 0
+        self.deadline_ns = 0
+        self.resyncs = 0
+        self._cpu_origin_ns = 0
+        self._spin_origin_ns = 0
+
+    def start(self):
+        self.origin_ns = self.deadline_ns = self.clock.now_ns()
+        self._cpu_origin_ns = time.thread_time_ns()
+        self._spin_origin_ns = self.clock.spin_ns
+        self.resyncs = 0
+
+    def wait(self, delay: float) -> bool:
+        """Wait until the next deadline. Return False if woken early."""
+        self.deadline_ns += round(delay * 1e9)
+        now = self.clock.now_ns()
+        if self.deadline_ns > now:
+            return self.clock.sleep_until(self.deadline_ns, self.wake_event)
+        if self.max_lag_ns is not None and now - self.deadline_ns > self.max_lag_ns:
+            self.deadline_ns = now
+            self.resyncs += 1
+        return not self.wake_event.is_set()
+
+    def sleep_until(self, at_ns: int) -> bool:
+        """Wait for ``at_ns`` without moving the deadline. Return False if woken early."""
+        if at_ns > self.clock.now_ns():
+            return self.clock.sleep_until(at_ns, self.wake_event)
+        return not self.wake_event.is_set()
+
+    def shift(self, ns: int):
+        """Move the whole schedule ``ns`` later, e.g. past a pause."""
+        self.origin_ns += ns
+        self.deadline_ns += ns
+
+    def elapsed(self) -> float:
+        return (self.clock.now_ns() - self.origin_ns) / 1e9
+
+    def stats(self) -> dict:
+        elapsed = self.elapsed()
+        cpu = (time.thread_time_ns() - self._cpu_origin_ns) / 1e9
+        return {
+            "elapsed_s": elapsed,
+            "cpu_s": cpu,
+            "cpu_share": cpu / elapsed if elapsed > 0 else 0.0,
+            "spin_s": (self.clock.spin_ns - self._spin_origin_ns) / 1e9,
+            "resyncs": self.resyncs,
+        }
+
+class KeyRollover:
+    """Holds each key down for a dwell time, so keystrokes can overlap.
+
+    Press and release events sit in one binary heap keyed by absolute time
+    and are dispatched in that order: with a dwell longer than the gap to the
+    next key, that key goes down before the previous one comes up. type(),
+    backspace() and wait() stand in for the backend's and the scheduler's in
+    the executor loop; presses land on the scheduler's deadlines as before.
+    """
+
+    def __init__(self, backend: KeyboardBackend, scheduler: DeadlineScheduler, dwell, rng=random):
+        self.backend = backend
+        self.scheduler = scheduler
+        self.dwell = dwell  # (low, high) seconds
+        self.rng = rng
+        self._heap = []  # (time_ns, seq, event kind, key, seq of the press)
+        self._seq = 0
+        self._held = {}  # key -> seq of the press holding it down
+
+    def _dispatch(self, at_ns, seq, kind, key, press):
+        held = self._held
+        if kind == EVENT_PRESS:
+            if key in held:
+                # A key can't go down twice; lift it early
+                self.backend.key_up(key)
+            self.backend.key_down(key)
+            held[key] = seq
+        elif held.get(key) == press:
+            # Otherwise a later press of the same key already lifted it
+            self.backend.key_up(key)
+            del held[key]
+
+    def type(self, ch: str):
+        at_ns = self.scheduler.deadline_ns
+        heap = self._heap
+        seq = self._seq = self._seq + 2
+        heapq.heappush(heap, (at_ns, seq, EVENT_PRESS, ch, seq))
+        dwell_ns = round(self.rng.uniform(*self.dwell) * 1e9)
+        heapq.heappush(heap, (at_ns + dwell_ns, seq + 1, EVENT_RELEASE, ch, seq))
+        while heap and heap[0][0] <= at_ns:
+            self._dispatch(*heapq.heappop(heap))
+
+    def backspace(self):
+        self.type(KEY_BACKSPACE)
+
+    def wait(self, delay: float) -> bool:
+        """Like DeadlineScheduler.wait, releasing keys that come due meanwhile."""
+        scheduler = self.scheduler
+        until_ns = scheduler.deadline_ns + round(delay * 1e9)
+        heap = self._heap
+        while heap and heap[0][0] < until_ns:
+            if not scheduler.sleep_until(heap[0][0]):
+                break
+            self._dispatch(*heapq.heappop(heap))
+        return scheduler.wait(delay)
+
+    def finish(self):
+        """Release the keys still down on schedule (all of them at once if woken)."""
+        heap = self._heap
+        while heap:
+            if not self.scheduler.sleep_until(heap[0][0]):
+                break
+            self._dispatch(*heapq.heappop(heap))
+        self.release_all()
+
+    def release_all(self):
+        """Lift every held key now, e.g. on pause or stop."""
+        for key in self._held:
+            self.backend.key_up(key)
+        self._held.clear()
+        self._heap.clear()
+
+class TypingReport:
+    """What an execute() run actually did."""
+
+    def __init__(self, duration: float, typed: int, backspaces: int, enters: int, stopped: bool):
+        self.duration = duration  # seconds, including the trailing pause
+        self.typed = typed
+        self.backspaces = backspaces
+        self.enters = enters
+        self.stopped = stopped
+        self.timeline = None  # [(time_ns, event kind, key)] when recorded
+        self.timing = None  # TimingProbe.summary() when instrumented
+
+    @property
+    def keystrokes(self) -> int:
+        return self.typed + self.backspaces + self.enters
+
+    @property
+    def net_chars(self) -> int:
+        return self.typed + self.enters - self.backspaces
+
+    @property
+    def achieved_wpm(self) -> float:
+        # Same 5-chars-per-word convention as secs_per_char_for_wpm
+        if self.duration <= 0:
+            return 0.0
+        return self.net_chars / 5.0 / (self.duration / 60.0)
+
+    def __repr__(self):
+        return (f"TypingReport(duration={self.duration:.3f}s, keystrokes={self.keystrokes}, "
+                f"backspaces={self.backspaces}, achieved_wpm={self.achieved_wpm:.1f}, "
+                f"stopped={self.stopped})")
+
+def _percentile(sorted_values: list, q: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+class TimingProbe:
+    """Per-key timing samples in preallocated ring buffers.
+
+    For every injected key: the scheduled time, the actual time the backend
+    was called and how long the call took (all ns on the executor's clock).
+    """
+
+    def __init__(self, capacity=1 << 18):
+        self.capacity = capacity
+        self.scheduled = array("q", [0]) * capacity
+        self.actual = array("q", [0]) * capacity
+        self.call = array("q", [0]) * capacity
+        self.total = 0
+
+    def record(self, scheduled_ns: int, actual_ns: int, end_ns: int):
+        i = self.total % self.capacity
+        self.scheduled[i] = scheduled_ns
+        self.actual[i] = actual_ns
+        self.call[i] = end_ns - actual_ns
+        self.total += 1
+
+    def _retained(self, column: array) -> list:
+        n = min(self.total, self.capacity)
+        return [column[j % self.capacity] for j in range(self.total - n, self.total)]
+
+    def summary(self, bins=10) -> dict:
+        """Lateness percentiles, drift, injection cost and an inter-key histogram (ms)."""
+        scheduled = self._retained(self.scheduled)
+        actual = self._retained(self.actual)
+        if not actual:
+            return {"keys": 0}
+        late = [(a - s) / 1e6 for s, a in zip(scheduled, actual)]
+        late_sorted = sorted(late)
+        calls = [c / 1e6 for c in self._retained(self.call)]
+        intervals = [(b - a) / 1e6 for a, b in zip(actual, actual[1:])]
+        histogram = {"edges_ms": [], "counts": []}
+        if intervals:
+            lo, hi = min(intervals), max(intervals)
+            width = (hi - lo) / bins or 1.0
+            counts = [0] * bins
+            for v in intervals:
+                counts[min(bins - 1, int((v - lo) / width))] += 1
+            histogram = {"edges_ms": [lo + width * k for k in range(bins + 1)], "counts": counts}
+        return {
+            "keys": len(actual),
+            "dropped": self.total - len(actual),
+            # Lateness of the last key: how far the run ended up off schedule
+            "drift_ms": late[-1],
+            "late_p50_ms": _percentile(late_sorted, 50),
+            "late_p95_ms": _percentile(late_sorted, 95),
+            "late_p99_ms": _percentile(late_sorted, 99),
+            "late_max_ms": late_sorted[-1],
+            "call_mean_ms": sum(calls) / len(calls),
+            "call_max_ms": max(calls),
+            "interval_histogram": histogram,
+        }
+
+def _net_chars(kinds: array) -> int:
+    return kinds.count(ACTION_TYPE) + kinds.count(ACTION_ENTER) - kinds.count(ACTION_BACKSPACE)
+
+class TypingCursor:
+    """Where a run is in its source text.
+
+    ``token_index`` and ``char_offset`` point just past the last token typed
+    completely. ``committed`` is the net number of characters in the target
+    field; ``boundary_committed`` the same at that token boundary, so the
+    difference is a partly typed token that resuming backspaces over first.
+    """
+
+    def __init__(self, token_index=0, char_offset=0, committed=0, boundary_committed=0):
+        self.token_index = token_index
+        self.char_offset = char_offset
+        self.committed = committed
+        self.boundary_committed = boundary_committed
+
+    def __repr__(self):
+        return (f"TypingCursor(token_index={self.token_index}, char_offset={self.char_offset}, "
+                f"committed={self.committed}, boundary_committed={self.boundary_committed})")
+
+    def save(self, path: str):
+        """Write the cursor as JSON; atomic, so a crash never leaves half a file."""
+        # A temp file of its own, so concurrent saves can't replace each other's
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                   suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(vars(self), f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "TypingCursor":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+# Pause ranges (seconds) drawn uniformly by the planners
+LONG_WORD = 8                      # words at least this long get a short pause
+LONG_WORD_PAUSE = (0.08, 0.22)
+THINK_PAUSE = (0.25, 0.9)          # after a word, with think_pause_chance
+SENTENCE_PAUSE = (0.25, 0.65)      # after . ! ?
+CLAUSE_PAUSE = (0.08, 0.25)        # after , ; :
+
+# Letter typo kinds and how often each is picked
+LETTER_TYPOS = ("substitution", "transposition", "duplicate", "omission")
+LETTER_TYPO_WEIGHTS = (0.45, 0.25, 0.2, 0.1)
+
+# A word draws at most one letter typo, placed inside one of its pieces of at
+# most TYPO_SEGMENT letters, so a long run (URL segment, hash, CJK sentence)
+# costs no more to correct than a short word. Omissions are backspaced over at
+# most CORRECTION_WINDOW keys.
+TYPO_SEGMENT = 12
+CORRECTION_WINDOW = 4
+
+def typo_segments(word: str) -> list:
+    """Split ``word`` into near-equal pieces of at most TYPO_SEGMENT chars."""
+    n = len(word)
+    k = max(1, -(-n // TYPO_SEGMENT))
+    return [word[n * j // k:n * (j + 1) // k] for j in range(k)]
+
+# Presets selectable from the GUI and the CLI
+PERSONALITIES = {
+    "Balanced": dict(min_wpm=45, max_wpm=70, letter_typo_rate=0.03, punct_typo_rate=0.02,
+                     think_pause_chance=0.08, jitter_std=0.25),
+    "Fast but Messy": dict(min_wpm=70, max_wpm=110, letter_typo_rate=0.06, punct_typo_rate=0.04,
+                           think_pause_chance=0.05, jitter_std=0.28),
+    "Slow and Careful": dict(min_wpm=30, max_wpm=45, letter_typo_rate=0.015, punct_typo_rate=0.01,
+                             think_pause_chance=0.12, jitter_std=0.18),
+}
+
 class Settings:
     def __init__(self,
                  min_wpm=45,
@@ -95,7 +967,8 @@ class Settings:
                  micro_pauses=True,
                  think_pause_chance=0.08,
                  jitter_std=0.25,
-                 correction_latency=(0.15, 0.55)):
+                 correction_latency=(0.15, 0.55),
+                 dwell=None):
         self.min_wpm = min_wpm
         self.max_wpm = max_wpm
         self.letter_typo_rate = letter_typo_rate
@@ -105,421 +978,1503 @@ class Settings:
         self.think_pause_chance = think_pause_chance
         self.jitter_std = jitter_std  # stddev (fraction of base delay)
         self.correction_latency = correction_latency
+        # (low, high) seconds each key is held down, letting keys overlap;
+        # None presses and releases each key back to back
+        self.dwell = dwell
+
+    def sample_wpm(self, rng=random) -> float:
+        return rng.uniform(self.min_wpm, self.max_wpm)
+
+class NumpySampler:
+    """Draws a whole batch of tokens' timing with a few NumPy calls.
+
+    Same distributions as the per-call model in Settings.sample_wpm,
+    HumanTyper._char_delay and the _pause_after_* helpers, but vectorized
+    and seedable independently of the ``random`` module.
+    """
 
-    def sample_wpm(self) -> float:
-        return random.uniform(self.min_wpm, self.max_wpm)
+    def __init__(self, settings: Settings, seed=None):
+        self.np = load_numpy()
+        self.settings = settings
+        self.rng = self.np.random.default_rng(seed)
+
+    def token_wpms(self, n: int):
+        return self.rng.uniform(self.settings.min_wpm, self.settings.max_wpm, n)
+
+    def char_delays(self, base):
+        """Per-character delays around ``base`` (seconds), clamped like _char_delay."""
+        np = self.np
+        # random.gauss takes a negative sigma too; it means the same spread
+        jittered = self.rng.normal(base, base * abs(self.settings.jitter_std))
+        return np.maximum(0.001, np.minimum(jittered, base * 3))
+
+    def chance(self, n: int, p: float):
+        return self.rng.random(n) < p
+
+    def word_pauses(self, lengths):
+        np = self.np
+        n = len(lengths)
+        if not self.settings.micro_pauses:
+            return np.zeros(n)
+        long_word = np.where(lengths >= LONG_WORD, self.rng.uniform(*LONG_WORD_PAUSE, n), 0.0)
+        think = np.where(self.chance(n, self.settings.think_pause_chance),
+                         self.rng.uniform(*THINK_PAUSE, n), 0.0)
+        return long_word + think
+
+    def punct_pauses(self, codes):
+        np = self.np
+        n = len(codes)
+        if not self.settings.micro_pauses:
+            return np.zeros(n)
+        stop = np.isin(codes, [ord(c) for c in ".!?"])
+        soft = np.isin(codes, [ord(c) for c in ",;:"])
+        return (np.where(stop, self.rng.uniform(*SENTENCE_PAUSE, n), 0.0)
+                + np.where(soft, self.rng.uniform(*CLAUSE_PAUSE, n), 0.0))
 
 class HumanTyper:
-    def __init__(self, settings: Settings, ui_callback=None):
+    def __init__(self, settings: Settings, ui_callback=None, spin_threshold=None, backend=None,
+                 clock=None, seed=None, sampler=None, process_backend=None, probe=None,
+                 checkpoint_path=None, checkpoint_interval=5.0, verify=True, backend_options=None):
         self.settings = settings
-        self.keyboard = Controller() if Controller else None
+        # Scalar draws; a seed makes plans reproducible without touching global state
+        self.rng = random.Random(seed) if seed is not None else random
+        # Executor-side draws (dwell times), apart from the planner thread's rng
+        self.dwell_rng = random.Random(seed)
+        # Optional NumpySampler: plan() then draws timing in batches
+        self.sampler = sampler
+        # Name from BACKENDS: type_text() then injects keys from a separate
+        # process (see ProcessExecutor) and self.backend goes unused
+        self.process_backend = process_backend
+        # Constructor arguments for the process_backend
+        self.backend_options = backend_options or {}
+        if process_backend is not None and (probe is not None or checkpoint_path is not None):
+            # Neither timing nor the cursor is reported back from the child
+            raise ValueError("probe and checkpoint_path are not supported when typing "
+                             "from a separate process.")
+        if backend is None and process_backend is None:
+            backend = default_backend()
+        self.backend = backend
+        # Replay every planned batch against an EditorBuffer before it is typed
+        self.verify = verify
+        # Optional TimingProbe filled by execute(); summarized into report.timing
+        self.probe = probe
         self.stop_event = threading.Event()
+        self.pause_event = threading.Event()
+        self._resume_event = threading.Event()  # set whenever not paused
+        self._resume_event.set()
+        # Set by stop() and pause() to cut short whatever wait is in progress
+        self.wake_event = threading.Event()
+        # The cursor is saved here after every token, every checkpoint_interval
+        # seconds within long ones and on pause/stop; the file is removed once
+        # a run completes
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self._progress = None  # [plan, keys done, committed before, boundary before]
         self.ui_callback = ui_callback  # function(str) to post status
-
-    # ------------- Low-level key actions -------------
-    def _type_char(self, c: str):
-        if self.keyboard is None:
-            return
-        if c == "\n":
-            self.keyboard.press(Key.enter)
-            self.keyboard.release(Key.enter)
-        else:
-            # Controller.type handles shift for symbols
-            self.keyboard.type(c)
-
-    def _backspace(self, n=1, delay=0.045):
-        if self.keyboard is None:
-            return
-        for _ in range(n):
-            self.keyboard.press(Key.backspace)
-            self.keyboard.release(Key.backspace)
-            time.sleep(delay)
+        # spin_threshold (seconds) enables high-precision hybrid sleep/spin waits
+        self.clock = clock if clock is not None else RealClock(spin_threshold=spin_threshold)
+        self.scheduler = DeadlineScheduler(self.clock, wake_event=self.wake_event)
+        self._rollover = None  # KeyRollover of the current run when dwell is set
+        self._process_events = ()  # set by stop(), for a ProcessExecutor's child
+        self.timing_stats = None  # scheduler.stats() of the last run
+        self.last_report = None
+        self.stop_latency = None  # seconds from stop() to the executor letting go
+        self._stop_requested_ns = None
 
     # ------------- Delays -------------
     def _char_delay(self, base_wpm: float) -> float:
         base = secs_per_char_for_wpm(base_wpm)
         # Gaussian jitter; clamp to sane range
-        jittered = random.gauss(base, base * self.settings.jitter_std)
+        jittered = self.rng.gauss(base, base * self.settings.jitter_std)
         return max(0.001, min(jittered, base * 3))
 
-    def _pause_after_word(self, word: str):
+    def _pause_after_word(self, word: str) -> float:
         if not self.settings.micro_pauses:
-            return
+            return 0.0
+        pause = 0.0
         # Longer words: tiny pause
-        if len(word) >= 8:
-            time.sleep(random.uniform(0.08, 0.22))
+        if len(word) >= LONG_WORD:
+            pause += self.rng.uniform(*LONG_WORD_PAUSE)
         # Occasional "think" pause
-        if random.random() < self.settings.think_pause_chance:
-            time.sleep(random.uniform(0.25, 0.9))
+        if self.rng.random() < self.settings.think_pause_chance:
+            pause += self.rng.uniform(*THINK_PAUSE)
+        return pause
 
-    def _pause_after_punct(self, ch: str):
+    def _pause_after_punct(self, ch: str) -> float:
         if not self.settings.micro_pauses:
-            return
+            return 0.0
         if ch in ".!?":
-            time.sleep(random.uniform(0.25, 0.65))
+            return self.rng.uniform(*SENTENCE_PAUSE)
         elif ch in ",;:":
-            time.sleep(random.uniform(0.08, 0.25))
+            return self.rng.uniform(*CLAUSE_PAUSE)
+        return 0.0
 
-    # ------------- Typo strategies -------------
-    def _maybe_letter_typo(self, word: str, base_wpm: float):
-        """Return (did_typo: bool, typed_prefix: str, backspaces: int)."""
-        if not self.settings.enable_corrections:
-            return False, "", 0
-        if len(word) < 3 or random.random() >= self.settings.letter_typo_rate:
-            return False, "", 0
+    def _correction_latency(self) -> float:
+        # Time to realize a mistake
+        return self.rng.uniform(*self.settings.correction_latency)
 
+    # ------------- Planning primitives -------------
+    def _plan_slow(self, plan: KeystrokePlan, text: str, base_wpm: float):
+        for ch in text:
+            kind = ACTION_ENTER if ch == "\n" else ACTION_TYPE
+            plan.add(kind, ord(ch), self._char_delay(base_wpm))
+
+    def _plan_backspace(self, plan: KeystrokePlan, n=1, delay=BACKSPACE_DELAY):
+        for _ in range(n):
+            plan.add(ACTION_BACKSPACE, 0, delay)
+
+    # ------------- Typo strategies -------------
+    def _plan_letter_typo(self, word: str, base_wpm: float, plan: KeystrokePlan):
+        """Plan a typo + correction for ``word`` into ``plan``, the typo
+        already decided on.
+
+        Return (did_typo: bool, typed_prefix: str, backspaces: int), where
+        ``typed_prefix`` is the correct start of ``word`` left in the field
+        once the typo is fixed; the caller types the rest.
+        """
+        rng = self.rng
         # Choose a typo type
-        typo_type = random.choices(
-            ["substitution", "transposition", "duplicate", "omission"],
-            weights=[0.45, 0.25, 0.2, 0.1]
-        )[0]
+        typo_type = rng.choices(LETTER_TYPOS, weights=LETTER_TYPO_WEIGHTS)[0]
 
         if typo_type == "substitution":
-            i = random.randint(0, len(word) - 1)
-            wrong = adjacent_key(word[i])
+            i = rng.randint(0, len(word) - 1)
+            wrong = adjacent_key(word[i], rng)
             typed = word[:i] + wrong
-            self._type_slow(typed, base_wpm)
+            self._plan_slow(plan, typed, base_wpm)
             # realize mistake
-            time.sleep(random.uniform(*self.settings.correction_latency))
-            self._backspace(1)
-            return True, typed, 1
+            plan.add_pause(self._correction_latency())
+            self._plan_backspace(plan, 1)
+            return True, word[:i], 1
 
         if typo_type == "transposition" and len(word) >= 4:
-            i = random.randint(0, len(word) - 2)
+            i = rng.randint(0, len(word) - 2)
             if word[i].isspace() or word[i+1].isspace():
                 return False, "", 0
             typed = word[:i] + word[i+1] + word[i]
-            self._type_slow(typed, base_wpm)
-            time.sleep(random.uniform(*self.settings.correction_latency))
-            self._backspace(2)
-            return True, typed, 2
+            self._plan_slow(plan, typed, base_wpm)
+            plan.add_pause(self._correction_latency())
+            self._plan_backspace(plan, 2)
+            return True, word[:i], 2
 
         if typo_type == "duplicate":
-            i = random.randint(0, len(word) - 1)
+            i = rng.randint(0, len(word) - 1)
             typed = word[:i+1] + word[i]
-            self._type_slow(typed, base_wpm)
-            time.sleep(random.uniform(*self.settings.correction_latency))
-            self._backspace(1)
-            return True, typed, 1
+            self._plan_slow(plan, typed, base_wpm)
+            plan.add_pause(self._correction_latency())
+            self._plan_backspace(plan, 1)
+            return True, word[:i+1], 1
 
         if typo_type == "omission":
             # Skip a letter, then backspace and retype correct so far
-            i = random.randint(1, len(word) - 2)
+            i = rng.randint(1, len(word) - 2)
             typed = word[:i]  # missing char at i
-            self._type_slow(typed, base_wpm)
-            time.sleep(random.uniform(*self.settings.correction_latency))
-            # backspace typed so far, then retype correctly up to i
-            self._backspace(len(typed))
-            self._type_slow(word[:i], base_wpm)
-            return True, word[:i], len(typed)
+            self._plan_slow(plan, typed, base_wpm)
+            plan.add_pause(self._correction_latency())
+            # backspace the last few keys, then retype them up to i
+            n = min(i, CORRECTION_WINDOW)
+            self._plan_backspace(plan, n)
+            self._plan_slow(plan, word[i - n:i], base_wpm)
+            return True, word[:i], n
 
         return False, "", 0
 
-    def _maybe_punct_typo(self, punct: str, base_wpm: float) -> bool:
+    def _plan_word(self, plan: KeystrokePlan, word: str, base_wpm: float, typo=None):
+        """Plan ``word`` with at most one letter typo, made inside one of its
+        typo_segments() picked at random. ``typo`` is the decision already
+        drawn (vectorized planner); otherwise it is drawn here."""
+        if typo is None:
+            s = self.settings
+            typo = (s.enable_corrections and len(word) >= 3
+                    and self.rng.random() < s.letter_typo_rate)
+        if not typo or len(word) < 3:
+            self._plan_slow(plan, word, base_wpm)
+            return
+        segments = typo_segments(word)
+        k = self.rng.randrange(len(segments)) if len(segments) > 1 else 0
+        self._plan_slow(plan, "".join(segments[:k]), base_wpm)
+        segment = segments[k]
+        did_typo, typed_prefix, _ = self._plan_letter_typo(segment, base_wpm, plan)
+        # type the rest correctly
+        self._plan_slow(plan, segment[len(typed_prefix):] if did_typo else segment, base_wpm)
+        self._plan_slow(plan, "".join(segments[k + 1:]), base_wpm)
+
+    def _maybe_punct_typo(self, punct: str, base_wpm: float, plan: KeystrokePlan) -> bool:
         if not self.settings.enable_corrections:
             return False
-        if punct not in PUNCTUATION_SET or random.random() >= self.settings.punct_typo_rate:
+        if punct not in PUNCTUATION_SET or self.rng.random() >= self.settings.punct_typo_rate:
             return False
-        # Choose a nearby/wrong punctuation
-        candidates = list(PUNCTUATION_SET - {punct})
-        wrong = random.choice(candidates)
-        self._type_slow(wrong, base_wpm)
-        time.sleep(random.uniform(*self.settings.correction_latency))
-        self._backspace(1)
+        self._plan_punct_typo(punct, base_wpm, plan)
         return True
 
-    # ------------- Core typing -------------
-    def _type_slow(self, text: str, base_wpm: float):
-        for ch in text:
-            if self.stop_event.is_set():
-                return
-            self._type_char(ch)
-            time.sleep(self._char_delay(base_wpm))
+    def _plan_punct_typo(self, punct: str, base_wpm: float, plan: KeystrokePlan):
+        # Choose a nearby/wrong punctuation
+        candidates = sorted(PUNCTUATION_SET - {punct})
+        wrong = self.rng.choice(candidates)
+        self._plan_slow(plan, wrong, base_wpm)
+        plan.add_pause(self._correction_latency())
+        self._plan_backspace(plan, 1)
+
+    # ------------- Planning -------------
+    def _plan_token(self, plan: KeystrokePlan, token: str):
+        # Choose a WPM for this token/word
+        base_wpm = self.settings.sample_wpm(self.rng)
+
+        if token.strip() == "":
+            # spaces/newlines as-is
+            self._plan_slow(plan, token, base_wpm)
+        elif is_word(token):
+            # A "word"
+            self._plan_word(plan, token, base_wpm)
+            plan.add_pause(self._pause_after_word(token))
+        elif token in PUNCTUATION_SET:
+            # Maybe wrong punctuation then fix
+            self._maybe_punct_typo(token, base_wpm, plan)
+            self._plan_slow(plan, token, base_wpm)
+            plan.add_pause(self._pause_after_punct(token))
+        else:
+            # Other symbols
+            self._plan_slow(plan, token, base_wpm)
+
+    def _plan_tokens_vectorized(self, tokens: list) -> KeystrokePlan:
+        """Plan ``tokens`` with batched NumPy draws from self.sampler.
+
+        Every character is first planned as a plain keystroke in bulk; the
+        few tokens that draw a typo are then re-planned one by one and
+        spliced in.
+        """
+        sampler = self.sampler
+        np = sampler.np
+        s = self.settings
+        plan = KeystrokePlan()
+        n = len(tokens)
+        if n == 0:
+            return plan
+
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=n)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        codes = np.frombuffer("".join(tokens).encode("utf-32-le"), dtype=np.uint32)
+
+        # Classify tokens like _plan_token does. Multi-char tokens are always
+        # runs of word characters; they are words unless they contain '_' or
+        # nothing but apostrophes.
+        first = codes[starts]
+        single = lengths == 1
+        single_codes = np.unique(first[single])
+        alnum_codes = [c for c in single_codes.tolist() if chr(c).isalnum()]
+        has_underscore = np.add.reduceat((codes == ord("_")).astype(np.int64), starts) > 0
+        apostrophes = np.add.reduceat((codes == ord("'")).astype(np.int64), starts)
+        words = np.where(single, np.isin(first, alnum_codes), ~has_underscore & (apostrophes < lengths))
+        puncts = single & np.isin(first, [ord(c) for c in PUNCTUATION_SET])
+
+        # Bulk timing for every character
+        wpms = sampler.token_wpms(n)
+        base = 12.0 / np.maximum(wpms, 1.0)
+        delays = sampler.char_delays(np.repeat(base, lengths))
+        kinds = np.where(codes == ord("\n"), ACTION_ENTER, ACTION_TYPE).astype(np.uint8)
+
+        pauses = np.zeros(n)
+        pauses[words] = sampler.word_pauses(lengths[words])
+        pauses[puncts] = sampler.punct_pauses(first[puncts])
+        delays[ends - 1] += pauses
+
+        # Tokens that draw a typo get planned on the scalar path
+        letter_typos = np.zeros(n, dtype=bool)
+        punct_typos = np.zeros(n, dtype=bool)
+        if s.enable_corrections:
+            # One decision per word of 3+ letters
+            eligible = words & (lengths >= 3)
+            letter_typos[eligible] = sampler.chance(int(eligible.sum()), s.letter_typo_rate)
+            punct_typos[puncts] = sampler.chance(int(puncts.sum()), s.punct_typo_rate)
+
+        pieces = []
+        pos = 0
+        actions = lengths.copy()  # keystrokes per token
+        for t in np.flatnonzero(letter_typos | punct_typos).tolist():
+            start, end = int(starts[t]), int(ends[t])
+            pieces.append((kinds[pos:start], codes[pos:start], delays[pos:start]))
+            token, wpm = tokens[t], float(wpms[t])
+            segment = KeystrokePlan()
+            if letter_typos[t]:
+                self._plan_word(segment, token, wpm, True)
+            else:
+                self._plan_punct_typo(token, wpm, segment)
+                self._plan_slow(segment, token, wpm)
+            segment.add_pause(float(pauses[t]))
+            pieces.append(segment.to_numpy())
+            actions[t] = len(segment)
+            pos = end
+        pieces.append((kinds[pos:], codes[pos:], delays[pos:]))
+
+        plan.kinds.frombytes(np.concatenate([p[0] for p in pieces]).astype(np.uint8).tobytes())
+        plan.codes.frombytes(np.concatenate([p[1] for p in pieces])
+                             .astype("u%d" % plan.codes.itemsize).tobytes())
+        plan.delays.frombytes(np.concatenate([p[2] for p in pieces]).astype(np.float64).tobytes())
+        itemsize = "u%d" % plan.token_ends.itemsize
+        plan.token_ends.frombytes(np.cumsum(actions).astype(itemsize).tobytes())
+        plan.token_chars.frombytes(ends.astype(itemsize).tobytes())
+        return plan
+
+    def _plan_tokens(self, tokens: list) -> KeystrokePlan:
+        if self.sampler is not None:
+            return self._plan_tokens_vectorized(tokens)
+        plan = KeystrokePlan()
+        for token in tokens:
+            self._plan_token(plan, token)
+            plan.end_token(len(token))
+        return plan
+
+    def iter_plan(self, source, batch_tokens=None, resume_from=None):
+        """Yield plans for consecutive batches of tokens of ``source``.
+
+        ``source`` is a str or a text file; it is read lazily, so planning and
+        typing can start before the whole input has been seen. With
+        ``resume_from`` (a TypingCursor) the first plan backspaces any partial
+        token typed after the cursor's last token boundary, and planning
+        continues from that token.
+
+        With ``verify`` set, each batch is checked to type exactly its tokens
+        and PlanMismatchError is raised otherwise.
+        """
+        if batch_tokens is None:
+            # NumPy batches need to be larger to pay off
+            batch_tokens = 4096 if self.sampler is not None else 256
+        # A batch from a stream is also cut short when it has no more input
+        # ready, so slowly arriving text gets typed as it comes
+        streaming = not isinstance(source, str)
+        tokens = iter_tokens(source, short=_READ_SHORT if streaming else None)
+        first_token = first_char = 0
+        if resume_from is not None:
+            first_token, first_char = resume_from.token_index, resume_from.char_offset
+            skip = first_token
+            while skip:
+                token = next(tokens, None)
+                if token is None:
+                    break
+                if token is not _READ_SHORT:
+                    skip -= 1
+            rewind = KeystrokePlan(first_token, first_char)
+            self._plan_backspace(rewind, resume_from.committed - resume_from.boundary_committed)
+            if len(rewind):
+                yield rewind
+        if streaming:
+            batches = _token_batches(tokens, batch_tokens)
+        else:
+            batches = iter(lambda: list(itertools.islice(tokens, batch_tokens)), [])
+        for batch in batches:
+            plan = self._plan_tokens(batch)
+            if self.verify:
+                verify_plan(plan, "".join(batch))
+            plan.first_token, plan.first_char = first_token, first_char
+            first_token += len(batch)
+            first_char += plan.token_chars[-1]
+            yield plan
+
+    def plan(self, source) -> KeystrokePlan:
+        """Make every random decision for ``source`` (str or text file) up front.
+
+        The returned plan can be inspected, cached and replayed with execute().
+        """
+        plan = KeystrokePlan()
+        for part in self.iter_plan(source):
+            plan.extend(part)
+        return plan
 
-    def type_text(self, text: str):
-        if self.keyboard is None:
+    # ------------- Core typing -------------
+    def _require_backend(self):
+        if self.backend is None:
             raise RuntimeError("pynput is not available. Please install it with 'pip install pynput'.")
 
-        # Normalize line endings
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-
-        # Split into tokens keeping punctuation
-        tokens = []
-        current = []
-        for ch in text:
-            if ch.isalnum() or ch in ("'", "_"):
-                current.append(ch)
-            else:
-                if current:
-                    tokens.append("".join(current))
-                    current = []
-                tokens.append(ch)
-        if current:
-            tokens.append("".join(current))
-
-        i = 0
-        while i < len(tokens) and not self.stop_event.is_set():
-            token = tokens[i]
-
-            # Choose a WPM for this token/word
-            base_wpm = self.settings.sample_wpm()
-
-            if token.strip() == "":
-                # spaces/newlines as-is
-                self._type_slow(token, base_wpm)
-                i += 1
+    def _hold(self) -> bool:
+        """Handle a wake at a keystroke boundary. Return False if stopped.
+
+        While paused, blocks until resume() and shifts the schedule by the time
+        spent paused; then finishes the wait the wake cut short.
+        """
+        scheduler = self.scheduler
+        rollover = self._rollover
+        while not self.stop_event.is_set():
+            if self.pause_event.is_set():
+                # Don't leave keys or Shift held while the user has the keyboard
+                if rollover is not None:
+                    rollover.release_all()
+                self.backend.release_modifiers()
+                self.save_checkpoint()
+                if self.ui_callback:
+                    self.ui_callback("Paused.")
+                paused_ns = self.clock.now_ns()
+                self._resume_event.wait()
+                scheduler.shift(self.clock.now_ns() - paused_ns)
+                if self.ui_callback and not self.stop_event.is_set():
+                    self.ui_callback("Typing...")
                 continue
-
-            if token.isalnum() or ("'" in token and token.replace("'", "").isalnum()):
-                # A "word"
-                did_typo, typed_prefix, backspaces = self._maybe_letter_typo(token, base_wpm)
-                if self.stop_event.is_set():
-                    break
-                # type the rest correctly
-                remaining = token[len(typed_prefix):] if did_typo else token
-                self._type_slow(remaining, base_wpm)
-                self._pause_after_word(token)
-            elif token in PUNCTUATION_SET:
-                # Maybe wrong punctuation then fix
-                did_punct_typo = self._maybe_punct_typo(token, base_wpm)
-                if self.stop_event.is_set():
+            self.wake_event.clear()
+            if self.stop_event.is_set() or self.pause_event.is_set():
+                continue  # raced with stop() or pause()
+            if (scheduler if rollover is None else rollover).wait(0.0):
+                return True
+        return False
+
+    def _autosave(self, finished: threading.Event, due: threading.Event):
+        # The executor sets ``due`` at every token boundary; the write itself
+        # stays off its thread
+        while True:
+            due.wait(self.checkpoint_interval)
+            due.clear()
+            if finished.is_set():
+                return
+            self.save_checkpoint()
+
+    def execute(self, plans, resume_from=None) -> TypingReport:
+        """Type a KeystrokePlan, or each plan of an iterable in turn.
+
+        ``resume_from`` is the TypingCursor the plans continue from (see
+        iter_plan), so cursor() keeps counting from there.
+        """
+        self._require_backend()
+        if isinstance(plans, KeystrokePlan):
+            plans = (plans,)
+        wake_event = self.wake_event
+        scheduler = self.scheduler
+        rollover = self._rollover = None
+        if self.settings.dwell is not None:
+            rollover = self._rollover = KeyRollover(self.backend, scheduler, self.settings.dwell,
+                                                    self.dwell_rng)
+        keys = self.backend if rollover is None else rollover
+        type_char = keys.type
+        backspace = keys.backspace
+        wait = scheduler.wait if rollover is None else rollover.wait
+        probe = self.probe
+        now_ns = self.clock.now_ns
+        report = TypingReport(0.0, 0, 0, 0, stopped=False)
+        committed = boundary = 0
+        if resume_from is not None:
+            committed, boundary = resume_from.committed, resume_from.boundary_committed
+        self._progress = None
+        finished = threading.Event()
+        autosave = save_due = None
+        if self.checkpoint_path is not None:
+            save_due = threading.Event()
+            autosave = threading.Thread(target=self._autosave, args=(finished, save_due), daemon=True)
+            autosave.start()
+        scheduler.start()
+        try:
+            for plan in plans:
+                progress = self._progress = [plan, 0, committed, boundary]
+                done = 0
+                # Token boundaries to checkpoint at
+                ends = plan.token_ends if save_due is not None else ()
+                k = 0
+                next_end = ends[0] if ends else 0
+                for kind, code, delay in plan:
+                    if wake_event.is_set() and not self._hold():
+                        self._record_stop_latency()
+                        report.stopped = True
+                        break
+                    if probe is not None:
+                        injected_ns = now_ns()
+                    if kind == ACTION_BACKSPACE:
+                        backspace()
+                    else:
+                        type_char(chr(code))
+                    if probe is not None:
+                        probe.record(scheduler.deadline_ns, injected_ns, now_ns())
+                    done += 1
+                    progress[1] = done
+                    if done == next_end:
+                        save_due.set()
+                        k += 1
+                        next_end = ends[k] if k < len(ends) else 0
+                    wait(delay)
+                kinds = plan.kinds[:done]
+                report.typed += kinds.count(ACTION_TYPE)
+                report.backspaces += kinds.count(ACTION_BACKSPACE)
+                report.enters += kinds.count(ACTION_ENTER)
+                if report.stopped:
                     break
-                self._type_slow(token, base_wpm)
-                self._pause_after_punct(token)
-            else:
-                # Other symbols/spaces/newlines
-                self._type_slow(token, base_wpm)
-
-            i += 1
+                # Plans end on token boundaries
+                committed = boundary = committed + _net_chars(kinds)
+            if not report.stopped and self.stop_event.is_set():
+                # Stopped while waiting on the planner, e.g. for a slow stream
+                self._record_stop_latency()
+                report.stopped = True
+            if rollover is not None and not report.stopped:
+                rollover.finish()
+        finally:
+            finished.set()
+            if save_due is not None:
+                save_due.set()
+            if rollover is not None:
+                rollover.release_all()
+            self.backend.close()
+            self.timing_stats = scheduler.stats()
+            close = getattr(plans, "close", None)
+            if close is not None:
+                close()
+            # Let an autosave in flight land before the final save (and removal)
+            if autosave is not None:
+                autosave.join()
+            self.save_checkpoint()
+        if not report.stopped and self.checkpoint_path is not None:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+        report.duration = self.timing_stats["elapsed_s"]
+        if probe is not None:
+            report.timing = probe.summary()
+            report.timing["achieved_wpm"] = report.achieved_wpm
+        self.last_report = report
+        return report
+
+    def type_text(self, source, resume_from=None) -> TypingReport:
+        """Plan ``source`` (str or text file) on a background thread while typing it.
+
+        With ``resume_from`` (a TypingCursor) typing continues where that
+        cursor was taken instead of at the start of ``source``.
+        """
+        pipeline = PlanPipeline(self, source, resume_from=resume_from)
+        if self.process_backend is not None:
+            return ProcessExecutor(self, self.process_backend).run(pipeline)
+        self._require_backend()
+        return self.execute(pipeline, resume_from=resume_from)
+
+    def simulate(self, text) -> TypingReport:
+        """Run ``text`` against a virtual clock and a recording backend.
+
+        Takes CPU time only; the report carries the exact event timeline.
+        """
+        plan = self.plan(text)
+        clock = VirtualClock()
+        recorder = RecordingBackend(capacity=max(1, 2 * len(plan)), clock=clock.now_ns)
+        sim = HumanTyper(self.settings, backend=recorder, clock=clock)
+        sim.rng, sim.dwell_rng = self.rng, self.dwell_rng
+        report = sim.execute(plan)
+        report.timeline = recorder.events()
+        return report
+
+    # ------------- Position -------------
+    def cursor(self) -> TypingCursor:
+        """Position of the current (or last) run; safe to call from any thread.
+
+        Not tracked when typing from a separate process.
+        """
+        progress = self._progress
+        if progress is None:
+            return TypingCursor()
+        plan, done, committed, boundary = progress
+        k = bisect.bisect_right(plan.token_ends, done)
+        char_offset = plan.first_char
+        if k:
+            end = plan.token_ends[k - 1]
+            boundary = committed + _net_chars(plan.kinds[:end])
+            char_offset += plan.token_chars[k - 1]
+        return TypingCursor(plan.first_token + k, char_offset,
+                            committed + _net_chars(plan.kinds[:done]), boundary)
+
+    def save_checkpoint(self):
+        if self.checkpoint_path is not None and self._progress is not None:
+            self.cursor().save(self.checkpoint_path)
+
+    def _record_stop_latency(self):
+        if self._stop_requested_ns is not None and self.stop_latency is None:
+            self.stop_latency = (time.perf_counter_ns() - self._stop_requested_ns) / 1e9
 
     # Public controls
-    def start(self, text: str, countdown=3):
+    def start(self, text, countdown=3, resume_from=None) -> "TypingJob":
+        """Type ``text`` (str or text file) on a background thread after a countdown."""
         self.stop_event.clear()
+        self.pause_event.clear()
+        self._resume_event.set()
+        self.wake_event.clear()
+        self.stop_latency = None
+        self._stop_requested_ns = None
+        job = TypingJob(self)
         def run():
-            if self.ui_callback:
-                self.ui_callback("Click into your target text field now...")
-            for sec in range(countdown, 0, -1):
+            try:
                 if self.ui_callback:
-                    self.ui_callback(f"Typing starts in {sec}...")
-                print("\a", end="")  # system beep (may be ignored)
-                time.sleep(1.0)
-            if self.ui_callback:
-                self.ui_callback("Typing...")
-            self.type_text(text)
+                    self.ui_callback("Click into your target text field now...")
+                sec = countdown
+                while sec > 0 and not self.stop_event.is_set():
+                    if self.pause_event.is_set():
+                        if self.ui_callback:
+                            self.ui_callback("Paused.")
+                        self._resume_event.wait()
+                        # Give the user the whole countdown to get back to the target
+                        sec = countdown
+                        continue
+                    if self.ui_callback:
+                        self.ui_callback(f"Typing starts in {sec}...")
+                    print("\a", end="")  # system beep (may be ignored)
+                    if not self.clock.sleep_until(self.clock.now_ns() + 1_000_000_000, self.wake_event):
+                        # Woken by stop() or pause(); both are checked above
+                        self.wake_event.clear()
+                        continue
+                    sec -= 1
+                if self.stop_event.is_set():
+                    self._record_stop_latency()
+                    report = TypingReport(0.0, 0, 0, 0, stopped=True)
+                else:
+                    if self.ui_callback:
+                        self.ui_callback("Typing...")
+                    report = self.type_text(text, resume_from=resume_from)
+            except BaseException as e:
+                if self.ui_callback:
+                    self.ui_callback(f"Error: {e}")
+                job._finish(None, e)
+                return
             if self.ui_callback:
-                self.ui_callback("Done or stopped.")
-        t = threading.Thread(target=run, daemon=True)
-        t.start()
-        return t
+                self.ui_callback("Stopped." if report.stopped else "Done.")
+            job._finish(report, None)
+        job.thread = threading.Thread(target=run, daemon=True)
+        job.thread.start()
+        return job
 
     def stop(self):
+        if self._stop_requested_ns is None:
+            self._stop_requested_ns = time.perf_counter_ns()
         self.stop_event.set()
+        self._resume_event.set()
+        self.wake_event.set()
+        for event in self._process_events:
+            event.set()
+
+    def pause(self):
+        """Hold typing at the next keystroke boundary until resume()."""
+        if self.process_backend is not None:
+            raise RuntimeError("pause() is not supported when typing from a separate process.")
+        self._resume_event.clear()
+        self.pause_event.set()
+        self.wake_event.set()
+
+    def resume(self):
+        self.pause_event.clear()
+        self._resume_event.set()
+
+    @property
+    def paused(self) -> bool:
+        return self.pause_event.is_set()
+
+
+class TypingJob:
+    """Future-like handle for a run started with HumanTyper.start().
+
+    The result is the run's TypingReport. Done callbacks are invoked with the
+    job on the typing thread (or right away if the job already finished), so
+    GUI code must marshal them onto its own loop.
+    """
+
+    def __init__(self, typer: HumanTyper):
+        self.typer = typer
+        self.thread = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._report = None
+        self._error = None
+
+    def _finish(self, report, error):
+        with self._lock:
+            self._report = report
+            self._error = error
+            self._finished.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def add_done_callback(self, fn):
+        with self._lock:
+            if not self._finished.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
 
+    def cancel(self) -> bool:
+        """Stop the run. Return False if it had already finished."""
+        if self._finished.is_set():
+            return False
+        self.typer.stop()
+        return True
 
-# ---------------------------
-# GUI
-# ---------------------------
-
-PERSONALITIES = {
-    "Balanced": dict(min_wpm=45, max_wpm=70, letter_typo_rate=0.03, punct_typo_rate=0.02,
-                     think_pause_chance=0.08, jitter_std=0.25),
-    "Fast but Messy": dict(min_wpm=70, max_wpm=110, letter_typo_rate=0.06, punct_typo_rate=0.04,
-                           think_pause_chance=0.05, jitter_std=0.28),
-    "Slow and Careful": dict(min_wpm=30, max_wpm=45, letter_typo_rate=0.015, punct_typo_rate=0.01,
-                             think_pause_chance=0.12, jitter_std=0.18),
-}
-
-class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Human Typist")
-        self.geometry("860x640")
-        self.resizable(True, True)
-
-        self.settings = Settings()
-        self.typer = None
-
-        self._build_ui()
-
-    def _build_ui(self):
-        root = ttk.Frame(self, padding=12)
-        root.pack(fill="both", expand=True)
-
-        # Top: instructions
-        self.info = tk.StringVar(value="Paste your text below. Set options. Click Start, then click into your target field.")
-        info_lbl = ttk.Label(root, textvariable=self.info, foreground="#333")
-        info_lbl.pack(anchor="w", pady=(0,6))
-
-        # Text input
-        txt_frame = ttk.LabelFrame(root, text="Input Text")
-        txt_frame.pack(fill="both", expand=True)
-        self.textbox = scrolledtext.ScrolledText(txt_frame, wrap=tk.WORD, height=16)
-        self.textbox.pack(fill="both", expand=True, padx=6, pady=6)
-
-        # Options
-        opt = ttk.LabelFrame(root, text="Typing Settings")
-        opt.pack(fill="x", pady=8)
-
-        # Personality
-        ttk.Label(opt, text="Preset:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
-        self.preset = ttk.Combobox(opt, values=list(PERSONALITIES.keys()), state="readonly")
-        self.preset.set("Balanced")
-        self.preset.grid(row=0, column=1, sticky="w", padx=6, pady=4)
-        self.preset.bind("<<ComboboxSelected>>", self.apply_preset)
-
-        # WPM range
-        ttk.Label(opt, text="Min WPM:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
-        self.min_wpm_var = tk.StringVar(value=str(self.settings.min_wpm))
-        ttk.Entry(opt, textvariable=self.min_wpm_var, width=8).grid(row=1, column=1, sticky="w", padx=6, pady=4)
-
-        ttk.Label(opt, text="Max WPM:").grid(row=1, column=2, sticky="w", padx=6, pady=4)
-        self.max_wpm_var = tk.StringVar(value=str(self.settings.max_wpm))
-        ttk.Entry(opt, textvariable=self.max_wpm_var, width=8).grid(row=1, column=3, sticky="w", padx=6, pady=4)
-
-        # Typos
-        ttk.Label(opt, text="Letter typo %:").grid(row=2, column=0, sticky="w", padx=6, pady=4)
-        self.letter_typo_var = tk.StringVar(value=str(int(self.settings.letter_typo_rate*100)))
-        ttk.Entry(opt, textvariable=self.letter_typo_var, width=8).grid(row=2, column=1, sticky="w", padx=6, pady=4)
-
-        ttk.Label(opt, text="Punct typo %:").grid(row=2, column=2, sticky="w", padx=6, pady=4)
-        self.punct_typo_var = tk.StringVar(value=str(int(self.settings.punct_typo_rate*100)))
-        ttk.Entry(opt, textvariable=self.punct_typo_var, width=8).grid(row=2, column=3, sticky="w", padx=6, pady=4)
-
-        # Corrections & pauses
-        self.corr_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(opt, text="Simulate corrections", variable=self.corr_var).grid(row=3, column=0, sticky="w", padx=6, pady=4)
-
-        self.pause_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(opt, text="Smart micro-pauses", variable=self.pause_var).grid(row=3, column=1, sticky="w", padx=6, pady=4)
-
-        ttk.Label(opt, text="Think pause chance %:").grid(row=3, column=2, sticky="w", padx=6, pady=4)
-        self.think_var = tk.StringVar(value=str(int(self.settings.think_pause_chance*100)))
-        ttk.Entry(opt, textvariable=self.think_var, width=8).grid(row=3, column=3, sticky="w", padx=6, pady=4)
-
-        ttk.Label(opt, text="Jitter (std as % of base):").grid(row=4, column=0, sticky="w", padx=6, pady=4)
-        self.jitter_var = tk.StringVar(value=str(int(self.settings.jitter_std*100)))
-        ttk.Entry(opt, textvariable=self.jitter_var, width=8).grid(row=4, column=1, sticky="w", padx=6, pady=4)
-
-        # Buttons
-        btns = ttk.Frame(root)
-        btns.pack(fill="x", pady=8)
-        self.start_btn = ttk.Button(btns, text="Start Typing (3s)", command=self.on_start)
-        self.start_btn.pack(side="left", padx=6)
-        self.stop_btn = ttk.Button(btns, text="Stop", command=self.on_stop, state="disabled")
-        self.stop_btn.pack(side="left", padx=6)
-        ttk.Button(btns, text="Preview Plan", command=self.on_preview).pack(side="left", padx=6)
-
-        # Status
-        self.status = tk.StringVar(value="Ready.")
-        ttk.Label(root, textvariable=self.status).pack(anchor="w")
-
-        # Footer
-        tip = ("Tip: After clicking Start, immediately click into your target window (Google Docs, Word, etc.). "
-               "Grant Accessibility permissions on macOS (System Settings → Privacy & Security → Accessibility).")
-        ttk.Label(root, text=tip, wraplength=780, foreground="#555").pack(anchor="w", pady=(8,0))
-
-    def apply_preset(self, *_):
-        name = self.preset.get()
-        conf = PERSONALITIES.get(name, {})
-        # Update UI values
-        self.min_wpm_var.set(str(conf.get('min_wpm', self.settings.min_wpm)))
-        self.max_wpm_var.set(str(conf.get('max_wpm', self.settings.max_wpm)))
-        self.letter_typo_var.set(str(int(conf.get('letter_typo_rate', self.settings.letter_typo_rate)*100)))
-        self.punct_typo_var.set(str(int(conf.get('punct_typo_rate', self.settings.punct_typo_rate)*100)))
-        self.think_var.set(str(int(conf.get('think_pause_chance', self.settings.think_pause_chance)*100)))
-        self.jitter_var.set(str(int(conf.get('jitter_std', self.settings.jitter_std)*100)))
-
-    def _read_settings(self) -> Settings:
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def cancelled(self) -> bool:
+        return self.done() and self._report is not None and self._report.stopped
+
+    def wait(self, timeout=None) -> bool:
+        return self._finished.wait(timeout)
+
+    def exception(self, timeout=None):
+        if not self._finished.wait(timeout):
+            raise TimeoutError("typing job still running")
+        return self._error
+
+    def result(self, timeout=None) -> TypingReport:
+        error = self.exception(timeout)
+        if error is not None:
+            raise error
+        return self._report
+
+_PIPELINE_DONE = object()
+
+class _PlannerFailed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+class PlanPipeline:
+    """Plans ``source`` on its own thread, feeding a bounded queue.
+
+    Iterating yields the typer's iter_plan() batches in order. The planner
+    runs at most ``depth`` batches ahead, so the executor never waits on
+    tokenizing or sampling and memory stays constant for any input size.
+    Errors raised while planning are re-raised from the iterator.
+    """
+
+    def __init__(self, typer: HumanTyper, source, depth=8, batch_tokens=None, resume_from=None):
+        self.typer = typer
+        self.source = source
+        self.batch_tokens = batch_tokens
+        self.resume_from = resume_from
+        self.queue = queue.Queue(maxsize=depth)
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._produce, daemon=True)
+
+    def _put(self, item) -> bool:
+        while not self.closed.is_set():
+            try:
+                self.queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self):
         try:
-            min_wpm = float(self.min_wpm_var.get())
-            max_wpm = float(self.max_wpm_var.get())
-            ltr = float(self.letter_typo_var.get()) / 100.0
-            ptr = float(self.punct_typo_var.get()) / 100.0
-            think = float(self.think_var.get()) / 100.0
-            jit = float(self.jitter_var.get()) / 100.0
-        except ValueError:
-            messagebox.showerror("Invalid settings", "Please enter numeric values for WPM and percentages.")
-            raise
+            for plan in self.typer.iter_plan(self.source, self.batch_tokens, self.resume_from):
+                if not self._put(plan):
+                    return
+        except BaseException as e:
+            self._put(_PlannerFailed(e))
+            return
+        self._put(_PIPELINE_DONE)
+
+    def __iter__(self):
+        self.thread.start()
+        get = self.queue.get
+        stop_event = self.typer.stop_event
+        while True:
+            try:
+                item = get(timeout=0.05)
+            except queue.Empty:
+                # The planner may be blocked on its source; don't wait out a stop
+                if stop_event.is_set():
+                    return
+                continue
+            if item is _PIPELINE_DONE:
+                return
+            if isinstance(item, _PlannerFailed):
+                raise item.error
+            yield item
 
-        if min_wpm <= 0 or max_wpm < min_wpm:
-            messagebox.showerror("Invalid WPM", "Ensure Min WPM > 0 and Max WPM ≥ Min WPM.")
-            raise ValueError("Bad WPM range")
-
-        s = Settings(
-            min_wpm=min_wpm,
-            max_wpm=max_wpm,
-            letter_typo_rate=ltr,
-            punct_typo_rate=ptr,
-            enable_corrections=self.corr_var.get(),
-            micro_pauses=self.pause_var.get(),
-            think_pause_chance=think,
-            jitter_std=jit
-        )
-        return s
+    def close(self, timeout=0.2):
+        """Stop the planner; safe to call more than once.
 
-    def post_status(self, msg: str):
-        self.status.set(msg)
-        self.update_idletasks()
+        A planner still blocked reading its source after ``timeout`` seconds
+        is left behind (it is a daemon thread) and exits once the read returns.
+        """
+        self.closed.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
 
-    def on_preview(self):
-        # Light-weight preview: show a few sampled delays/typos likelihoods
-        try:
-            s = self._read_settings()
-        except Exception:
-            return
+# ---------------------------
+# Out-of-process execution
+# ---------------------------
 
-        sample_wpm = [round(random.uniform(s.min_wpm, s.max_wpm), 1) for _ in range(5)]
-        delays = [round(secs_per_char_for_wpm(w), 3) for w in sample_wpm]
-        preview = (f"Sample WPMs: {sample_wpm}\n"
-                   f"Base char delays (s): {delays}\n"
-                   f"Letter typo rate: {int(s.letter_typo_rate*100)}%\n"
-                   f"Punctuation typo rate: {int(s.punct_typo_rate*100)}%\n"
-                   f"Think pause chance: {int(s.think_pause_chance*100)}%\n"
-                   f"Corrections: {'on' if s.enable_corrections else 'off'} • Micro-pauses: {'on' if s.micro_pauses else 'off'}")
-        messagebox.showinfo("Preview", preview)
-
-    def on_start(self):
-        text = self.textbox.get("1.0", "end-1c")
-        if not text.strip():
-            messagebox.showwarning("Empty text", "Please paste some text to type.")
-            return
+# Slots of the int64 header at the start of a SharedPlanRing
+H_WRITE = 0         # actions written by the producer (monotonic)
+H_READ = 1          # actions consumed by the executor (monotonic)
+H_DONE = 2          # producer has written everything
+H_TYPED = 3
+H_BACKSPACES = 4
+H_ENTERS = 5
+H_ELAPSED_NS = 6
+H_CPU_NS = 7
+H_SPIN_NS = 8
+H_RESYNCS = 9
+H_STOPPED_NS = 10   # perf_counter_ns when the executor let go after a stop
+HEADER_SLOTS = 16
+
+class SharedPlanRing:
+    """Single-producer/single-consumer ring of plan actions in shared memory.
+
+    Holds the same three columns as KeystrokePlan. The executor reads slots
+    in place and publishes its progress counters through the header.
+    """
+
+    def __init__(self, capacity=1 << 16, name=None):
+        header_size = HEADER_SLOTS * 8
+        codes_size = capacity * array("I").itemsize
+        if name is None:
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=header_size + capacity * 9 + codes_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.capacity = capacity
+        buf = self.shm.buf
+        offset = header_size
+        self.header = buf[:offset].cast("q")
+        self.delays = buf[offset:offset + capacity * 8].cast("d")
+        offset += capacity * 8
+        self.codes = buf[offset:offset + codes_size].cast("I")
+        offset += codes_size
+        self.kinds = buf[offset:offset + capacity].cast("B")
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def push(self, plan: KeystrokePlan, pos: int) -> int:
+        """Copy as much of ``plan[pos:]`` as fits; return the new position."""
+        header = self.header
+        cap = self.capacity
+        w = header[H_WRITE]
+        n = min(cap - (w - header[H_READ]), len(plan) - pos)
+        done = 0
+        while done < n:
+            i = (w + done) % cap
+            m = min(n - done, cap - i)
+            a = pos + done
+            self.kinds[i:i + m] = plan.kinds[a:a + m]
+            self.codes[i:i + m] = plan.codes[a:a + m]
+            self.delays[i:i + m] = plan.delays[a:a + m]
+            done += m
+        header[H_WRITE] = w + n
+        return pos + n
+
+    def close(self):
+        for view in (self.header, self.delays, self.codes, self.kinds):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+def _process_executor_main(ring_name: str, capacity: int, backend_name: str, spin_threshold, stop,
+                           ready, dwell=None, backend_options=None):
+    # Runs in the child process: drain the ring, pacing keys like execute()
+    ring = SharedPlanRing(capacity, name=ring_name)
+    backend = rollover = None
+    try:
+        backend = BACKENDS[backend_name](**(backend_options or {}))
+        scheduler = DeadlineScheduler(RealClock(spin_threshold=spin_threshold), wake_event=stop)
+        if dwell is not None:
+            rollover = KeyRollover(backend, scheduler, dwell)
+        keys = backend if rollover is None else rollover
+        type_char = keys.type
+        backspace = keys.backspace
+        wait = scheduler.wait if rollover is None else rollover.wait
+        header, kinds, codes, delays = ring.header, ring.kinds, ring.codes, ring.delays
+        r = header[H_READ]
+        started = False
+        while True:
+            if r == header[H_WRITE]:
+                if header[H_DONE] and r == header[H_WRITE]:
+                    break
+                if stop.is_set():
+                    break
+                # Sleep until the parent writes, finishes or stops; anything
+                # written before the clear is seen on the next pass
+                ready.wait(1.0)
+                ready.clear()
+                continue
+            if not started:
+                scheduler.start()
+                started = True
+            if stop.is_set():
+                break
+            i = r % capacity
+            kind, delay = kinds[i], delays[i]
+            if kind == ACTION_BACKSPACE:
+                backspace()
+                header[H_BACKSPACES] += 1
+            else:
+                type_char(chr(codes[i]))
+                header[H_ENTERS if kind == ACTION_ENTER else H_TYPED] += 1
+            r += 1
+            header[H_READ] = r
+            wait(delay)
+        if rollover is not None and started:
+            rollover.finish()
+        if stop.is_set():
+            header[H_STOPPED_NS] = time.perf_counter_ns()
+        if started:
+            stats = scheduler.stats()
+            header[H_ELAPSED_NS] = round(stats["elapsed_s"] * 1e9)
+            header[H_CPU_NS] = round(stats["cpu_s"] * 1e9)
+            header[H_SPIN_NS] = round(stats["spin_s"] * 1e9)
+            header[H_RESYNCS] = stats["resyncs"]
+    finally:
+        if rollover is not None:
+            rollover.release_all()
+        if backend is not None:
+            backend.close()
+        ring.close()
+
+class ProcessExecutor:
+    """Runs the executor in its own process, fed through a SharedPlanRing.
+
+    Keystroke timing then no longer competes for the GIL with the GUI or the
+    planner. The backend is created in the child from its BACKENDS name.
+    """
+
+    def __init__(self, typer: HumanTyper, backend_name="pynput", capacity=1 << 16):
+        self.typer = typer
+        self.backend_name = backend_name
+        self.capacity = capacity
+
+    def _idle(self, proc) -> bool:
+        # The ring is full: give the child time to drain it. False once we should give up.
+        multiprocessing.connection.wait([proc.sentinel], timeout=0.05)
+        return proc.is_alive() and not self.typer.stop_event.is_set()
+
+    def run(self, plans) -> TypingReport:
+        if isinstance(plans, KeystrokePlan):
+            plans = (plans,)
+        typer = self.typer
+        ctx = multiprocessing.get_context("spawn")
+        ring = SharedPlanRing(self.capacity)
+        stop = ctx.Event()
+        ready = ctx.Event()  # set whenever there is news for an idle child
+        spin = getattr(typer.clock, "spin_threshold_ns", None)
+        proc = ctx.Process(
+            target=_process_executor_main,
+            args=(ring.name, self.capacity, self.backend_name,
+                  None if spin is None else spin / 1e9, stop, ready, typer.settings.dwell,
+                  typer.backend_options),
+            daemon=True)
+        proc.start()
+        # stop() signals the child directly, so nothing here polls for it
+        typer._process_events = (stop, ready)
+        if typer.stop_event.is_set():
+            stop.set()
+            ready.set()
+        try:
+            running = True
+            for plan in plans:
+                pos = 0
+                while running and pos < len(plan):
+                    pos = ring.push(plan, pos)
+                    ready.set()
+                    if pos < len(plan):
+                        running = self._idle(proc)
+                if not running:
+                    break
+            ring.header[H_DONE] = 1
+            ready.set()
+            proc.join()
+            if proc.exitcode:
+                raise RuntimeError(f"Executor process failed (exit code {proc.exitcode}).")
+            header = ring.header
+            elapsed = header[H_ELAPSED_NS] / 1e9
+            cpu = header[H_CPU_NS] / 1e9
+            typer.timing_stats = {
+                "elapsed_s": elapsed,
+                "cpu_s": cpu,
+                "cpu_share": cpu / elapsed if elapsed > 0 else 0.0,
+                "spin_s": header[H_SPIN_NS] / 1e9,
+                "resyncs": header[H_RESYNCS],
+            }
+            stopped = header[H_STOPPED_NS] != 0
+            if stopped and typer._stop_requested_ns is not None:
+                typer.stop_latency = (header[H_STOPPED_NS] - typer._stop_requested_ns) / 1e9
+            report = TypingReport(elapsed, header[H_TYPED], header[H_BACKSPACES], header[H_ENTERS],
+                                  stopped=stopped)
+        finally:
+            typer._process_events = ()
+            stop.set()
+            ready.set()
+            proc.join()
+            close = getattr(plans, "close", None)
+            if close is not None:
+                close()
+            ring.close()
+            ring.unlink()
+        typer.last_report = report
+        return report
 
-        # Ensure dependency
-        if Controller is None:
-            messagebox.showerror("Missing dependency",
-                                 "The 'pynput' package is required.\n\nInstall with:\n    pip install pynput")
-            return
+# ---------------------------
+# Estimates
+# ---------------------------
 
-        try:
-            self.settings = self._read_settings()
-        except Exception:
-            return
+def _clamped_normal_mean(mu: float, sigma: float, lo: float, hi: float) -> float:
+    """E[min(max(X, lo), hi)] for X ~ Normal(mu, sigma)."""
+    if sigma <= 0:
+        return min(max(mu, lo), hi)
+    a = (lo - mu) / sigma
+    b = (hi - mu) / sigma
+    cdf_a = 0.5 * (1 + math.erf(a / math.sqrt(2)))
+    cdf_b = 0.5 * (1 + math.erf(b / math.sqrt(2)))
+    pdf_a = math.exp(-a * a / 2) / math.sqrt(2 * math.pi)
+    pdf_b = math.exp(-b * b / 2) / math.sqrt(2 * math.pi)
+    return lo * cdf_a + hi * (1 - cdf_b) + mu * (cdf_b - cdf_a) + sigma * (pdf_a - pdf_b)
+
+def expected_char_delay(settings: Settings, steps=64) -> float:
+    """Mean of HumanTyper._char_delay with the WPM drawn by Settings.sample_wpm."""
+    def at(wpm):
+        base = secs_per_char_for_wpm(wpm)
+        return _clamped_normal_mean(base, base * abs(settings.jitter_std), 0.001, base * 3)
+    lo, hi = settings.min_wpm, settings.max_wpm
+    if hi <= lo:
+        return at(lo)
+    # Simpson's rule over the uniform WPM draw
+    h = (hi - lo) / steps
+    total = at(lo) + at(hi) + sum((4 if k % 2 else 2) * at(lo + k * h) for k in range(1, steps))
+    return total * h / 3 / (hi - lo)
+
+def _letter_typo_costs(n: int) -> tuple:
+    """Expected (extra keys typed, backspaces, corrections) for an n-letter word
+    that drew a letter typo, following HumanTyper._plan_letter_typo."""
+    sub, trans, dup, omit = LETTER_TYPO_WEIGHTS
+    if n < 4:
+        trans = 0.0  # too short to transpose: typed plainly
+    # Every erased key is typed again; omission erases the last keys of a
+    # prefix of 1..n-2 letters, at most CORRECTION_WINDOW of them
+    omitted = sum(min(i, CORRECTION_WINDOW) for i in range(1, n - 1)) / (n - 2)
+    extra = sub + 2 * trans + dup + omit * omitted
+    backspaces = sub + 2 * trans + dup + omit * omitted
+    return extra, backspaces, sub + trans + dup + omit
+
+class Estimate:
+    """Expected cost of typing a text; see estimate()."""
+
+    def __init__(self, chars: int, keystrokes: float, backspaces: float, typos: float,
+                 pauses: float, duration: float):
+        self.chars = chars
+        self.keystrokes = keystrokes
+        self.backspaces = backspaces
+        self.typos = typos
+        self.pauses = pauses
+        self.duration = duration
+
+    def __repr__(self):
+        return (f"Estimate(duration={self.duration:.1f}s, keystrokes={self.keystrokes:.0f}, "
+                f"backspaces={self.backspaces:.1f}, typos={self.typos:.1f}, pauses={self.pauses:.1f})")
+
+def estimate(source, settings: Settings) -> Estimate:
+    """Expected duration, keystrokes and pauses for typing ``source`` (str or text file).
+
+    Closed-form expectations of the planner's draws, in one pass over the
+    tokens; nothing is simulated, so it is instant even for very large inputs.
+    """
+    s = settings
+    letter_p = s.letter_typo_rate if s.enable_corrections else 0.0
+    punct_p = s.punct_typo_rate if s.enable_corrections else 0.0
+    think_p = s.think_pause_chance if s.micro_pauses else 0.0
+    chars = keys = backspaces = typos = pauses = pause_s = 0.0
+    for token, count in Counter(iter_tokens(source)).items():
+        n = len(token)
+        chars += count * n
+        keys += count * n
+        if is_word(token):
+            if n >= 3 and letter_p:
+                # The typo lands in one segment, each equally likely
+                pieces = typo_segments(token)
+                p = count * letter_p / len(pieces)
+                for segment in pieces:
+                    extra, bs, fixes = _letter_typo_costs(len(segment))
+                    keys += p * extra
+                    backspaces += p * bs
+                    typos += p * fixes
+            if s.micro_pauses:
+                long_word = n >= LONG_WORD
+                pause_s += count * (think_p * sum(THINK_PAUSE) / 2
+                                    + (sum(LONG_WORD_PAUSE) / 2 if long_word else 0.0))
+                pauses += count * (1.0 if long_word else think_p)
+        elif token in PUNCTUATION_SET:
+            # A wrong mark, typed and erased before the right one
+            keys += count * punct_p
+            backspaces += count * punct_p
+            typos += count * punct_p
+            if s.micro_pauses:
+                pause_s += count * sum(SENTENCE_PAUSE if token in ".!?" else CLAUSE_PAUSE) / 2
+                pauses += count
+    duration = (keys * expected_char_delay(s) + backspaces * BACKSPACE_DELAY
+                + typos * sum(s.correction_latency) / 2 + pause_s)
+    return Estimate(int(chars), keys + backspaces, backspaces, typos, pauses, duration)
+
+def settings_for_duration(source, settings: Settings, target: float, tolerance=0.01) -> Settings:
+    """Copy of ``settings`` with the WPM range rescaled so that typing
+    ``source`` is expected to take ``target`` seconds, within ``tolerance``
+    (relative).
+
+    Typo rates, pauses and the max/min WPM ratio are kept, so a preset keeps
+    its character. Only the character delay depends on WPM, so the text is
+    scanned once and the scale is found by bisection on the closed-form
+    estimate. Raises ValueError if no WPM gets there.
+    """
+    e = estimate(source, settings)
+    typed = e.keystrokes - e.backspaces
+    fixed = e.duration - typed * expected_char_delay(settings)
+    if target <= fixed:
+        raise ValueError(f"Pauses and corrections alone are expected to take {fixed:.1f}s; "
+                         f"can't finish in {target:.1f}s.")
+
+    def scaled(k):
+        s = Settings(**vars(settings))
+        s.min_wpm = settings.min_wpm * k
+        s.max_wpm = settings.max_wpm * k
+        return s
 
-        self.typer = HumanTyper(self.settings, ui_callback=self.post_status)
-        self.start_btn.configure(state="disabled")
-        self.stop_btn.configure(state="normal")
-        self.post_status("Prepare target window. Typing starts after countdown...")
-        self.typer.start(text, countdown=3)
-
-        # Re-enable Start when thread finishes (polling)
-        def poll():
-            if self.typer and self.typer.stop_event.is_set():
-                self.start_btn.configure(state="normal")
-                self.stop_btn.configure(state="disabled")
-            else:
-                self.after(300, poll)
-        self.after(300, poll)
+    # Expected duration falls as the scale grows
+    lo, hi = 1e-3, 1e3
+    for _ in range(100):
+        k = math.sqrt(lo * hi)
+        s = scaled(k)
+        duration = fixed + typed * expected_char_delay(s)
+        if abs(duration - target) <= tolerance * target:
+            return s
+        if duration > target:
+            lo = k
+        else:
+            hi = k
+    raise ValueError(f"Can't reach {target:.1f}s by changing the WPM range.")
+
+def _token_table(source):
+    """Token lengths and classes of ``source`` as NumPy arrays.
+
+    A run's total duration doesn't depend on token order, so tokens are
+    grouped by value and repeated by count.
+    """
+    np = load_numpy()
+    counts = Counter(iter_tokens(source))
+    tokens = list(counts)
+    repeat = np.fromiter(counts.values(), dtype=np.int64, count=len(tokens))
+    def column(values, dtype):
+        return np.repeat(np.fromiter(values, dtype=dtype, count=len(tokens)), repeat)
+    # Typo segment lengths of each distinct word of 3+ letters; a token's
+    # are segment_lengths[segment_first:segment_first + segment_count]
+    segment_lengths = []
+    segment_first = []
+    segment_count = []
+    for token in tokens:
+        segment_first.append(len(segment_lengths))
+        if len(token) >= 3 and is_word(token):
+            pieces = typo_segments(token)
+            segment_lengths.extend(map(len, pieces))
+            segment_count.append(len(pieces))
+        else:
+            segment_count.append(0)
+    return {
+        "lengths": column(map(len, tokens), np.int64),
+        "words": column(map(is_word, tokens), bool),
+        "puncts": column((t in PUNCTUATION_SET for t in tokens), bool),
+        "codes": column((ord(t[0]) if len(t) == 1 else 0 for t in tokens), np.int64),
+        "segment_first": column(segment_first, np.int64),
+        "segment_count": column(segment_count, np.int64),
+        "segment_lengths": np.array(segment_lengths, dtype=np.int64),
+    }
+
+def _sample_letter_typos(sampler: NumpySampler, lengths):
+    """Draw kind and position for letter typos on words of ``lengths``, like
+    HumanTyper._plan_letter_typo; return (extra keys, backspaces, corrected)."""
+    np = sampler.np
+    rng = sampler.rng
+    weights = np.asarray(LETTER_TYPO_WEIGHTS) / sum(LETTER_TYPO_WEIGHTS)
+    kind = rng.choice(len(LETTER_TYPOS), size=len(lengths), p=weights)
+    backspaces = np.ones(len(lengths), dtype=np.int64)
+    corrected = np.ones(len(lengths), dtype=bool)
+    # transposition: two backspaces; words under 4 letters are typed plainly
+    trans = kind == 1
+    corrected[trans] = lengths[trans] >= 4
+    backspaces[trans] = 2 * corrected[trans]
+    # omission: the end of a prefix of 1..n-2 letters is erased and retyped
+    omit = np.flatnonzero(kind == 3)
+    backspaces[omit] = np.minimum(rng.integers(1, lengths[omit] - 1), CORRECTION_WINDOW)
+    # Every erased key is typed again
+    return backspaces.copy(), backspaces, corrected
+
+def _simulate_batch(table: dict, settings: Settings, runs: int, seed) -> "numpy.ndarray":
+    """Durations of ``runs`` independent plans of the text behind ``table``."""
+    sampler = NumpySampler(settings, seed=seed)
+    np = sampler.np
+    s = settings
+    n_tokens = len(table["lengths"])
+    lengths = np.tile(table["lengths"], runs)
+    words = np.tile(table["words"], runs)
+    puncts = np.tile(table["puncts"], runs)
+    n = len(lengths)
+
+    base = 12.0 / np.maximum(sampler.token_wpms(n), 1.0)
+    keys = sampler.char_delays(np.repeat(base, lengths)).reshape(runs, -1).sum(axis=1)
+    pauses = np.zeros(n)
+    pauses[words] = sampler.word_pauses(lengths[words])
+    pauses[puncts] = sampler.punct_pauses(np.tile(table["codes"], runs)[puncts])
+    total = keys + pauses.reshape(runs, n_tokens).sum(axis=1)
+    if not s.enable_corrections:
+        return total
+
+    # One draw per word of 3+ letters; a hit lands in one of its segments
+    eligible = np.flatnonzero(np.tile(table["segment_count"] > 0, runs))
+    letter = eligible[sampler.chance(len(eligible), s.letter_typo_rate)]
+    token = letter % n_tokens
+    pick = table["segment_first"][token] + sampler.rng.integers(0, table["segment_count"][token])
+    extra, backspaces, corrected = _sample_letter_typos(sampler, table["segment_lengths"][pick])
+    punct = np.flatnonzero(puncts)
+    punct = punct[sampler.chance(len(punct), s.punct_typo_rate)]
+    # A wrong mark is one extra key and one backspace
+    typos = np.concatenate([letter[corrected], punct])
+    extra_at = np.concatenate([letter, punct])
+    extra = np.concatenate([extra, np.ones(len(punct), dtype=np.int64)])
+    backspaces = np.concatenate([backspaces, np.ones(len(punct), dtype=np.int64)])
+
+    extra_keys = sampler.char_delays(np.repeat(base[extra_at], extra))
+    cost = np.zeros(len(extra_at))
+    np.add.at(cost, np.repeat(np.arange(len(extra_at)), extra), extra_keys)
+    cost += backspaces * BACKSPACE_DELAY
+    total += np.bincount(extra_at // n_tokens, weights=cost, minlength=runs)
+    latency = sampler.rng.uniform(*s.correction_latency, len(typos))
+    total += np.bincount(typos // n_tokens, weights=latency, minlength=runs)
+    return total
+
+class DurationDistribution:
+    """Sorted total durations (seconds) of independently simulated runs."""
+
+    def __init__(self, durations):
+        durations.sort()
+        self.durations = durations
+
+    def __len__(self):
+        return len(self.durations)
+
+    @property
+    def mean(self) -> float:
+        return float(self.durations.mean())
+
+    @property
+    def std(self) -> float:
+        return float(self.durations.std())
+
+    def percentile(self, q: float) -> float:
+        return float(load_numpy().percentile(self.durations, q))
+
+    def __repr__(self):
+        return (f"DurationDistribution(runs={len(self)}, mean={self.mean:.1f}s, "
+                f"p50={self.percentile(50):.1f}s, p95={self.percentile(95):.1f}s)")
+
+def simulate_durations(source, settings: Settings, runs=1000, seed=None, workers=None,
+                       batch_keys=1 << 22) -> DurationDistribution:
+    """Monte Carlo distribution of the time to type ``source`` (str or text file).
+
+    Draws per-token WPM, per-character jitter, typo kinds with their extra
+    keys, backspaces and correction latency, and pauses for ``runs`` runs
+    with batched NumPy draws. Runs are split into batches of about
+    ``batch_keys`` keystrokes; ``workers`` > 1 spreads the batches over a
+    process pool. A seed gives the same result for any number of workers.
+    """
+    if runs < 1:
+        raise ValueError(f"runs must be at least 1, got {runs}.")
+    np = load_numpy()
+    table = _token_table(source)
+    if not len(table["lengths"]):
+        return DurationDistribution(np.zeros(runs))
+    per_run = max(1, int(table["lengths"].sum()))
+    batch = max(1, min(runs, batch_keys // per_run))
+    sizes = [min(batch, runs - start) for start in range(0, runs, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers is None or workers <= 1 or len(sizes) == 1:
+        parts = [_simulate_batch(table, settings, size, sq) for size, sq in zip(sizes, seeds)]
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+            parts = list(pool.map(_simulate_batch, itertools.repeat(table), itertools.repeat(settings),
+                                  sizes, seeds))
+    return DurationDistribution(np.concatenate(parts))
 
-    def on_stop(self):
-        if self.typer:
-            self.typer.stop()
-        self.start_btn.configure(state="normal")
-        self.stop_btn.configure(state="disabled")
-        self.post_status("Stopped by user.")
+# ---------------------------
+# Command line
+# ---------------------------
 
-def main():
-    app = App()
-    app.mainloop()
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="human_typist",
+        description="Type a text file into the focused window with human-like timing and typos.")
+    p.add_argument("file", nargs="?",
+                   help="text file to type, or '-' for stdin (omit to open the GUI)")
+    p.add_argument("--encoding", default="utf-8", help="encoding of FILE (default: utf-8)")
+    p.add_argument("--preset", choices=list(PERSONALITIES), help="start from a GUI preset")
+    p.add_argument("--min-wpm", type=float)
+    p.add_argument("--max-wpm", type=float)
+    p.add_argument("--letter-typo-rate", type=float, help="probability per word, e.g. 0.03")
+    p.add_argument("--punct-typo-rate", type=float, help="probability per punctuation mark")
+    p.add_argument("--think-pause-chance", type=float, help="probability per word")
+    p.add_argument("--jitter-std", type=float, help="stddev as a fraction of the base delay")
+    p.add_argument("--dwell", type=float, nargs=2, metavar=("LOW", "HIGH"),
+                   help="hold each key down LOW-HIGH seconds, letting fast keys overlap")
+    p.add_argument("--no-corrections", action="store_true", help="disable typos and corrections")
+    p.add_argument("--no-micro-pauses", action="store_true", help="disable pauses after words/punctuation")
+    p.add_argument("--countdown", type=int, default=3, help="seconds before typing starts (default: 3)")
+    p.add_argument("--seed", type=int, help="seed the RNG for a reproducible run")
+    p.add_argument("--numpy", action="store_true",
+                   help="plan with batched NumPy draws (much faster on large inputs)")
+    p.add_argument("--spin-threshold", type=float,
+                   help="enable precise timing: spin this many seconds before each key")
+    p.add_argument("--backend", choices=list(BACKENDS), default="pynput",
+                   help="where keys go: the OS (pynput), nowhere (null) or memory (recording)")
+    p.add_argument("--no-shift-runs", action="store_true",
+                   help="never hold Shift across runs of capitals (only done on Linux uinput)")
+    p.add_argument("--process", action="store_true",
+                   help="inject keys from a separate process fed through shared memory")
+    p.add_argument("--instrument", action="store_true",
+                   help="record scheduled vs actual time of every key and print a timing summary "
+                        "(not with --process)")
+    p.add_argument("--checkpoint", metavar="PATH",
+                   help="save the typing position here while typing and on Ctrl+C "
+                        "(removed once the text is done; not with --process)")
+    p.add_argument("--resume", action="store_true",
+                   help="continue from the position saved in --checkpoint")
+    p.add_argument("--simulate", action="store_true",
+                   help="don't type; replay the run on a virtual clock and print a summary")
+    p.add_argument("--estimate", action="store_true",
+                   help="don't type; print the expected duration and keystrokes")
+    p.add_argument("--target-duration", type=float, metavar="SECONDS",
+                   help="rescale the WPM range so the text is expected to take this long")
+    p.add_argument("--runs", type=int, default=0,
+                   help="with --estimate, also simulate this many runs for P50/P95 times (needs numpy)")
+    p.add_argument("--workers", type=int, help="spread --runs over this many processes")
+    return p
+
+def settings_from_args(args, parser=None) -> Settings:
+    conf = dict(PERSONALITIES.get(args.preset, {}))
+    for name in ("min_wpm", "max_wpm", "letter_typo_rate", "punct_typo_rate",
+                 "think_pause_chance", "jitter_std"):
+        value = getattr(args, name)
+        if value is not None:
+            conf[name] = value
+    if args.no_corrections:
+        conf["enable_corrections"] = False
+    if args.no_micro_pauses:
+        conf["micro_pauses"] = False
+    if args.dwell is not None:
+        conf["dwell"] = tuple(args.dwell)
+    s = Settings(**conf)
+    msg = None
+    if s.min_wpm <= 0 or s.max_wpm < s.min_wpm:
+        msg = "Ensure --min-wpm > 0 and --max-wpm >= --min-wpm."
+    elif s.dwell is not None and not 0 <= s.dwell[0] <= s.dwell[1]:
+        msg = "Ensure 0 <= --dwell LOW <= HIGH."
+    if msg is not None:
+        if parser is not None:
+            parser.error(msg)
+        raise ValueError(msg)
+    return s
+
+def open_text(path: str, encoding="utf-8"):
+    if path == "-":
+        # Not closed afterwards: a stopped run may leave the planner blocked reading it
+        return contextlib.nullcontext(sys.stdin)
+    # newline="" keeps "\r\n" intact for iter_chunks to normalize
+    return open(path, encoding=encoding, newline="")
+
+def run_cli(args, parser=None) -> int:
+    settings = settings_from_args(args, parser)
+    with open_text(args.file, args.encoding) as text:
+        return _run_cli(args, settings, text)
+
+def _run_cli(args, settings: Settings, text) -> int:
+    if args.runs > 0 or args.target_duration is not None:
+        text = text.read()  # read more than once below
+    if args.target_duration is not None:
+        try:
+            settings = settings_for_duration(text, settings, args.target_duration)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Using {settings.min_wpm:.1f}-{settings.max_wpm:.1f} WPM.", file=sys.stderr)
+    if args.estimate:
+        e = estimate(text, settings)
+        print(f"Expected duration {e.duration:.1f}s, {e.keystrokes:.0f} keystrokes "
+              f"({e.backspaces:.0f} backspaces), {e.typos:.0f} corrections, {e.pauses:.0f} pauses.")
+        if args.runs > 0:
+            d = simulate_durations(text, settings, runs=args.runs, seed=args.seed, workers=args.workers)
+            print(f"Over {len(d)} simulated runs: P50 {d.percentile(50):.1f}s, "
+                  f"P95 {d.percentile(95):.1f}s, max {d.durations[-1]:.1f}s.")
+        return 0
+    sampler = NumpySampler(settings, seed=args.seed) if args.numpy else None
+    if args.simulate:
+        report = HumanTyper(settings, backend=NullBackend(), seed=args.seed, sampler=sampler).simulate(text)
+        print(f"Duration {report.duration:.1f}s, {report.keystrokes} keystrokes "
+              f"({report.backspaces} backspaces), {report.achieved_wpm:.1f} WPM achieved.")
+        return 0
+    resume_from = None
+    if args.process and (args.checkpoint or args.instrument):
+        print("--checkpoint and --instrument cannot be combined with --process.", file=sys.stderr)
+        return 2
+    if args.resume:
+        if not args.checkpoint:
+            print("--resume needs --checkpoint PATH.", file=sys.stderr)
+            return 2
+        try:
+            resume_from = TypingCursor.load(args.checkpoint)
+        except FileNotFoundError:
+            print(f"No checkpoint at {args.checkpoint}.", file=sys.stderr)
+            return 1
+        print(f"Resuming at character {resume_from.char_offset}.", file=sys.stderr)
+    if args.backend == "pynput" and not load_pynput():
+        print("The 'pynput' package is required. Install with: pip install pynput", file=sys.stderr)
+        return 1
+    options = {"shift_runs": False} if args.no_shift_runs and args.backend == "pynput" else {}
+    # In --process mode the child process creates its own backend
+    backend = None if args.process else BACKENDS[args.backend](**options)
+
+    typer = HumanTyper(settings, ui_callback=lambda msg: print(msg, file=sys.stderr),
+                       spin_threshold=args.spin_threshold, backend=backend,
+                       seed=args.seed, sampler=sampler,
+                       process_backend=args.backend if args.process else None,
+                       backend_options=options,
+                       probe=TimingProbe() if args.instrument else None,
+                       checkpoint_path=args.checkpoint)
+    job = typer.start(text, countdown=args.countdown, resume_from=resume_from)
+    try:
+        # Short waits keep Ctrl+C responsive
+        while not job.wait(0.1):
+            pass
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        print(f"Stopped (latency {typer.stop_latency or 0.0:.4f}s).", file=sys.stderr)
+        if args.checkpoint:
+            print(f"Position saved to {args.checkpoint}; rerun with --resume to continue.",
+                  file=sys.stderr)
+        return 130
+    error = job.exception()
+    if error is not None:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    stats = typer.timing_stats
+    if stats:
+        print(f"Elapsed {stats['elapsed_s']:.1f}s, CPU {stats['cpu_s']:.2f}s "
+              f"({stats['cpu_share']:.1%}).", file=sys.stderr)
+    if isinstance(backend, RecordingBackend):
+        print(f"Recorded {backend.total} key events.", file=sys.stderr)
+    report = typer.last_report
+    if report is not None and report.timing and report.timing["keys"]:
+        t = report.timing
+        print(f"Lateness p50/p95/p99 {t['late_p50_ms']:.2f}/{t['late_p95_ms']:.2f}/"
+              f"{t['late_p99_ms']:.2f} ms, drift {t['drift_ms']:.2f} ms, "
+              f"injection {t['call_mean_ms']:.3f} ms avg, {t['achieved_wpm']:.1f} WPM achieved.",
+              file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.file is None:
+        # tkinter and the GUI are only imported when actually needed
+        from human_typist_gui import main as gui_main
+        gui_main()
+        return 0
+    return run_cli(args, parser)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,277 @@
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from human_typist import (
+    HumanTyper,
+    KeystrokePlan,
+    NullBackend,
+    NumpySampler,
+    Settings,
+    VirtualClock,
+    adjacent_key,
+    iter_tokens,
+    normalize_newlines,
+    tokenize,
+    verify_plan,
+)
+
+# ---------------------------
+# Reference implementations
+# ---------------------------
+
+def legacy_tokenize(text: str) -> list:
+    # The per-character loop tokenize() used before the regex scanner
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    tokens = []
+    current = []
+    for ch in text:
+        if ch.isalnum() or ch in ("'", "_"):
+            current.append(ch)
+        else:
+            if current:
+                tokens.append("".join(current))
+                current = []
+            tokens.append(ch)
+    if current:
+        tokens.append("".join(current))
+    return tokens
+
+# ---------------------------
+# Corpora
+# ---------------------------
+
+CORPORA = {
+    "small": 20_000,
+    "medium": 200_000,
+    "large": 2_000_000,
+}
+
+def synthetic_text(n_chars: int, seed=0) -> str:
+    """Prose-like text: words of 1-12 letters, punctuation, line breaks."""
+    rng = random.Random(seed)
+    letters = "etaoinshrdlucmfwypvbgkjqxz"
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 12))) for _ in range(5000)]
+    vocab += ["don't", "it's", "snake_case", "2024", "Hello"]
+    out = []
+    size = 0
+    while size < n_chars:
+        word = rng.choice(vocab)
+        tail = rng.choice(("", "", "", "", ",", ".", "!\n", ";"))
+        piece = word + tail + " "
+        out.append(piece)
+        size += len(piece)
+    return "".join(out)[:n_chars]
+
+# ---------------------------
+# Benchmarks
+# ---------------------------
+#
+# Metric names encode their direction: "*_per_s" is higher-is-better, other
+# "*_s" / "*_ns" metrics are lower-is-better, anything else is informational.
+
+def best_of(fn, *args, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def per_call_ns(fn, n: int, repeat=3) -> float:
+    def loop():
+        for _ in range(n):
+            fn()
+    return best_of(loop, repeat=repeat) / n * 1e9
+
+def _engine(seed=0, sampler=False, **settings) -> HumanTyper:
+    s = Settings(**settings)
+    return HumanTyper(s, backend=NullBackend(), clock=VirtualClock(), seed=seed,
+                      sampler=NumpySampler(s, seed=seed) if sampler else None)
+
+def bench_tokenizer(text: str, repeat=3) -> dict:
+    assert tokenize(text) == legacy_tokenize(text)
+    legacy = best_of(legacy_tokenize, text, repeat=repeat)
+    current = best_of(tokenize, text, repeat=repeat)
+    streaming = best_of(lambda t: sum(1 for _ in iter_tokens(t)), text, repeat=repeat)
+    return {
+        "chars": len(text),
+        "legacy_s": legacy,
+        "regex_s": current,
+        "streaming_s": streaming,
+        "speedup": legacy / current if current > 0 else float("inf"),
+    }
+
+def bench_typo_decisions(n=50_000, repeat=3) -> dict:
+    typer = _engine()
+    forced = _engine(letter_typo_rate=1.0, punct_typo_rate=1.0)
+    plan = KeystrokePlan()
+    chars = "thequickbrownfoxjumpsoverthelazydog,.;"
+    words = ["typist", "keyboard", "the", "simulation", "a", "don't"]
+    i = [0]
+
+    def next_char():
+        i[0] += 1
+        return chars[i[0] % len(chars)]
+
+    def next_word():
+        i[0] += 1
+        return words[i[0] % len(words)]
+
+    def fresh(fn):
+        # Keep the scratch plan from growing across calls
+        def call():
+            fn()
+            del plan.kinds[:], plan.codes[:], plan.delays[:]
+        return call
+
+    return {
+        "adjacent_key_ns": per_call_ns(lambda: adjacent_key(next_char()), n, repeat),
+        "plan_word_ns": per_call_ns(
+            fresh(lambda: typer._plan_word(plan, next_word(), 60.0)), n, repeat),
+        "forced_plan_word_ns": per_call_ns(
+            fresh(lambda: forced._plan_word(plan, next_word(), 60.0)), n, repeat),
+        "maybe_punct_typo_ns": per_call_ns(
+            fresh(lambda: typer._maybe_punct_typo(".", 60.0, plan)), n, repeat),
+        "forced_punct_typo_ns": per_call_ns(
+            fresh(lambda: forced._maybe_punct_typo(".", 60.0, plan)), n, repeat),
+    }
+
+def bench_delay_sampling(n=200_000, repeat=3) -> dict:
+    typer = _engine()
+    rng = typer.rng
+    out = {
+        "char_delay_ns": per_call_ns(lambda: typer._char_delay(60.0), n, repeat),
+        "sample_wpm_ns": per_call_ns(lambda: typer.settings.sample_wpm(rng), n, repeat),
+        "pause_after_word_ns": per_call_ns(lambda: typer._pause_after_word("keyboards"), n, repeat),
+        "pause_after_punct_ns": per_call_ns(lambda: typer._pause_after_punct("."), n, repeat),
+    }
+    try:
+        sampler = NumpySampler(typer.settings, seed=0)
+    except RuntimeError:
+        return out
+    base = sampler.np.full(n, 0.2)
+    out["numpy_char_delay_ns"] = best_of(sampler.char_delays, base, repeat=repeat) / n * 1e9
+    return out
+
+def bench_engine(text: str, repeat=3) -> dict:
+    typer = _engine()
+    plan = typer.plan(text)
+    keys = len(plan)
+    out = {
+        "chars": len(text),
+        "keys": keys,
+        "plan_s": best_of(lambda: _engine().plan(text), repeat=repeat),
+        # Replaying the plan against an editor buffer (included in plan_s)
+        "verify_s": best_of(verify_plan, plan, normalize_newlines(text), repeat=repeat),
+        # Executor alone: walking a ready plan against the virtual clock
+        "execute_keys_per_s": keys / best_of(lambda: _engine().execute(plan), repeat=repeat),
+        # Planner thread + executor, as type_text() runs for real
+        "end_to_end_keys_per_s": keys / best_of(lambda: _engine().type_text(text), repeat=repeat),
+    }
+    try:
+        out["plan_numpy_s"] = best_of(lambda: _engine(sampler=True).plan(text), repeat=repeat)
+    except RuntimeError:
+        pass
+    return out
+
+BENCHMARKS = ("tokenizer", "typo", "delays", "engine")
+
+def run_suite(sizes, only=BENCHMARKS, repeat=3) -> dict:
+    results = {}
+    if "typo" in only:
+        results["typo"] = bench_typo_decisions(repeat=repeat)
+    if "delays" in only:
+        results["delays"] = bench_delay_sampling(repeat=repeat)
+    for size in sizes:
+        text = synthetic_text(CORPORA[size])
+        if "tokenizer" in only:
+            results[f"tokenizer/{size}"] = bench_tokenizer(text, repeat)
+        if "engine" in only:
+            results[f"engine/{size}"] = bench_engine(text, repeat)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+# ---------------------------
+# Baselines
+# ---------------------------
+
+def compare(current: dict, baseline: dict, tolerance=0.15) -> list:
+    """Return (benchmark, metric, baseline, current) for every regression."""
+    regressions = []
+    for name, metrics in baseline.get("results", {}).items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        for metric, base in metrics.items():
+            value = now.get(metric)
+            if value is None or not base:
+                continue
+            if metric.endswith("_per_s"):
+                worse = value < base * (1 - tolerance)
+            elif metric.endswith("_s") or metric.endswith("_ns"):
+                worse = value > base * (1 + tolerance)
+            else:
+                continue
+            if worse:
+                regressions.append((name, metric, base, value))
+    return regressions
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Benchmark tokenizing, typo decisions, delay sampling and engine throughput "
+                    "(null backend, virtual clock).")
+    p.add_argument("--sizes", default="small,medium,large",
+                   help="comma-separated corpora from: " + ", ".join(
+                       f"{k} ({v:,} chars)" for k, v in CORPORA.items()))
+    p.add_argument("--only", default=",".join(BENCHMARKS),
+                   help="comma-separated benchmarks from: " + ", ".join(BENCHMARKS))
+    p.add_argument("--repeat", type=int, default=3, help="best of N runs (default: 3)")
+    p.add_argument("--output", help="write results JSON here (default: stdout)")
+    p.add_argument("--baseline", help="compare against this results JSON; exit 1 on regressions")
+    p.add_argument("--save-baseline", help="also write results to this path as the new baseline")
+    p.add_argument("--tolerance", type=float, default=0.15,
+                   help="allowed slowdown before a metric counts as a regression (default: 0.15)")
+    args = p.parse_args(argv)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    only = [b for b in args.only.split(",") if b]
+    unknown = [s for s in sizes if s not in CORPORA] + [b for b in only if b not in BENCHMARKS]
+    if unknown:
+        p.error("unknown size/benchmark: " + ", ".join(unknown))
+
+    results = run_suite(sizes, only, args.repeat)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; nothing to compare.", file=sys.stderr)
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, base, value in regressions:
+            print(f"REGRESSION {name} {metric}: {base:.4g} -> {value:.4g}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+
+import argparse
+import random
+import sys
+
+from human_typist import (
+    HumanTyper,
+    KeystrokePlan,
+    NullBackend,
+    NumpySampler,
+    PlanMismatchError,
+    Settings,
+    estimate,
+    normalize_newlines,
+    verify_plan,
+)
+
+# ---------------------------
+# Random inputs
+# ---------------------------
+
+# Pools the generator draws characters from; weighted towards prose
+ALPHABETS = (
+    ("etaoinshrdlucmfwypvbgkjqxz", 40),
+    ("ETAOINSHRDLU", 6),
+    ("0123456789", 4),
+    (" ", 20),
+    (",.!?;:", 8),
+    ("'_-/()\"", 4),
+    ("\n\r\t", 3),
+    ("éèßøñüÉÇ", 2),
+    ("日本語中文한국어", 2),
+    ("Привет", 2),
+    ("😀🎉", 1),
+)
+
+def random_text(rng: random.Random, max_chars: int) -> str:
+    pools = [p for p, _ in ALPHABETS]
+    weights = [w for _, w in ALPHABETS]
+    n = rng.randint(0, max_chars)
+    # Occasionally one long unbroken run, like a URL segment or a hash
+    if rng.random() < 0.1:
+        return "".join(rng.choice("abcdef0123456789") for _ in range(n))
+    return "".join(rng.choice(rng.choices(pools, weights)[0]) for _ in range(n))
+
+def random_settings(rng: random.Random) -> Settings:
+    min_wpm = rng.uniform(5, 150)
+    return Settings(
+        min_wpm=min_wpm,
+        max_wpm=min_wpm + rng.uniform(0, 100),
+        letter_typo_rate=rng.choice((0.0, 0.03, rng.random(), 1.0)),
+        punct_typo_rate=rng.choice((0.0, 0.02, rng.random(), 1.0)),
+        enable_corrections=rng.random() < 0.9,
+        micro_pauses=rng.random() < 0.8,
+        think_pause_chance=rng.random(),
+        jitter_std=rng.uniform(0, 0.8),
+    )
+
+# ---------------------------
+# Checks
+# ---------------------------
+
+def check_case(seed: int, max_chars: int, numpy: bool):
+    """Plan one random text under random settings; raise on any mismatch."""
+    rng = random.Random(seed)
+    text = random_text(rng, max_chars)
+    settings = random_settings(rng)
+    sampler = NumpySampler(settings, seed=seed) if numpy and rng.random() < 0.5 else None
+    typer = HumanTyper(settings, backend=NullBackend(), seed=seed, sampler=sampler, verify=False)
+    expected = normalize_newlines(text)
+
+    # plan() or iter_plan() at a random batch size, so batch edges get exercised
+    plan = typer.plan(text) if rng.random() < 0.5 else None
+    if plan is None:
+        plan = KeystrokePlan()
+        for part in typer.iter_plan(text, batch_tokens=rng.randint(1, 64)):
+            plan.extend(part)
+    verify_plan(plan, expected)
+    if len(plan.token_chars) and plan.token_chars[-1] != len(expected):
+        raise AssertionError(f"token bookkeeping covers {plan.token_chars[-1]} of {len(expected)} chars")
+    if len(plan.token_ends) and plan.token_ends[-1] != len(plan):
+        raise AssertionError(f"token bookkeeping covers {plan.token_ends[-1]} of {len(plan)} keys")
+    if estimate(text, settings).chars != len(expected):
+        raise AssertionError("estimate() counted a different number of characters")
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Plan random texts under random settings and check that every plan "
+                    "types exactly its input.")
+    p.add_argument("--iterations", type=int, default=500, help="cases to run (default: 500)")
+    p.add_argument("--seed", type=int, default=0, help="seed of the first case (default: 0)")
+    p.add_argument("--max-chars", type=int, default=400, help="longest text (default: 400)")
+    p.add_argument("--no-numpy", action="store_true", help="only use the scalar planner")
+    args = p.parse_args(argv)
+
+    numpy = not args.no_numpy
+    if numpy:
+        try:
+            NumpySampler(Settings())
+        except RuntimeError:
+            numpy = False
+
+    failures = 0
+    for seed in range(args.seed, args.seed + args.iterations):
+        try:
+            check_case(seed, args.max_chars, numpy)
+        except (PlanMismatchError, AssertionError) as e:
+            failures += 1
+            print(f"FAIL seed {seed}: {e}", file=sys.stderr)
+    print(f"{args.iterations - failures}/{args.iterations} cases passed"
+          f"{'' if numpy else ' (scalar planner only)'}.", file=sys.stderr)
+    if failures:
+        print("Rerun one with: --seed SEED --iterations 1", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
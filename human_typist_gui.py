@@ -0,0 +1,318 @@
+import queue
+import random
+import tkinter as tk
+from tkinter import ttk
+from tkinter import scrolledtext, messagebox
+
+from human_typist import (
+    PERSONALITIES,
+    HumanTyper,
+    PynputBackend,
+    Settings,
+    estimate,
+    load_pynput,
+    settings_for_duration,
+    secs_per_char_for_wpm,
+)
+
+# ---------------------------
+# GUI
+# ---------------------------
+
+# Status label refresh period (~30 Hz)
+STATUS_INTERVAL_MS = 33
+
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Human Typist")
+        self.geometry("860x640")
+        self.resizable(True, True)
+
+        self.settings = Settings()
+        self.typer = None
+
+        # Worker threads post here; the Tk loop drains them (see _drain_status)
+        self._status_queue = queue.SimpleQueue()
+        self._call_queue = queue.SimpleQueue()
+
+        self._build_ui()
+        self.after(STATUS_INTERVAL_MS, self._drain_status)
+
+    def _build_ui(self):
+        root = ttk.Frame(self, padding=12)
+        root.pack(fill="both", expand=True)
+
+        # Top: instructions
+        self.info = tk.StringVar(value="Paste your text below. Set options. Click Start, then click into your target field.")
+        info_lbl = ttk.Label(root, textvariable=self.info, foreground="#333")
+        info_lbl.pack(anchor="w", pady=(0,6))
+
+        # Text input
+        txt_frame = ttk.LabelFrame(root, text="Input Text")
+        txt_frame.pack(fill="both", expand=True)
+        self.textbox = scrolledtext.ScrolledText(txt_frame, wrap=tk.WORD, height=16)
+        self.textbox.pack(fill="both", expand=True, padx=6, pady=6)
+
+        # Options
+        opt = ttk.LabelFrame(root, text="Typing Settings")
+        opt.pack(fill="x", pady=8)
+
+        # Personality
+        ttk.Label(opt, text="Preset:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        self.preset = ttk.Combobox(opt, values=list(PERSONALITIES.keys()), state="readonly")
+        self.preset.set("Balanced")
+        self.preset.grid(row=0, column=1, sticky="w", padx=6, pady=4)
+        self.preset.bind("<<ComboboxSelected>>", self.apply_preset)
+
+        # WPM range
+        ttk.Label(opt, text="Min WPM:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.min_wpm_var = tk.StringVar(value=str(self.settings.min_wpm))
+        ttk.Entry(opt, textvariable=self.min_wpm_var, width=8).grid(row=1, column=1, sticky="w", padx=6, pady=4)
+
+        ttk.Label(opt, text="Max WPM:").grid(row=1, column=2, sticky="w", padx=6, pady=4)
+        self.max_wpm_var = tk.StringVar(value=str(self.settings.max_wpm))
+        ttk.Entry(opt, textvariable=self.max_wpm_var, width=8).grid(row=1, column=3, sticky="w", padx=6, pady=4)
+
+        # Typos
+        ttk.Label(opt, text="Letter typo %:").grid(row=2, column=0, sticky="w", padx=6, pady=4)
+        self.letter_typo_var = tk.StringVar(value=str(int(self.settings.letter_typo_rate*100)))
+        ttk.Entry(opt, textvariable=self.letter_typo_var, width=8).grid(row=2, column=1, sticky="w", padx=6, pady=4)
+
+        ttk.Label(opt, text="Punct typo %:").grid(row=2, column=2, sticky="w", padx=6, pady=4)
+        self.punct_typo_var = tk.StringVar(value=str(int(self.settings.punct_typo_rate*100)))
+        ttk.Entry(opt, textvariable=self.punct_typo_var, width=8).grid(row=2, column=3, sticky="w", padx=6, pady=4)
+
+        # Corrections & pauses
+        self.corr_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(opt, text="Simulate corrections", variable=self.corr_var).grid(row=3, column=0, sticky="w", padx=6, pady=4)
+
+        self.pause_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(opt, text="Smart micro-pauses", variable=self.pause_var).grid(row=3, column=1, sticky="w", padx=6, pady=4)
+
+        ttk.Label(opt, text="Think pause chance %:").grid(row=3, column=2, sticky="w", padx=6, pady=4)
+        self.think_var = tk.StringVar(value=str(int(self.settings.think_pause_chance*100)))
+        ttk.Entry(opt, textvariable=self.think_var, width=8).grid(row=3, column=3, sticky="w", padx=6, pady=4)
+
+        ttk.Label(opt, text="Jitter (std as % of base):").grid(row=4, column=0, sticky="w", padx=6, pady=4)
+        self.jitter_var = tk.StringVar(value=str(int(self.settings.jitter_std*100)))
+        ttk.Entry(opt, textvariable=self.jitter_var, width=8).grid(row=4, column=1, sticky="w", padx=6, pady=4)
+
+        # Keeps keystroke timing independent of GUI activity
+        self.process_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opt, text="Type from a separate process", variable=self.process_var).grid(row=4, column=2, columnspan=2, sticky="w", padx=6, pady=4)
+
+        # Fit the WPM range to a time budget
+        ttk.Label(opt, text="Target time (min):").grid(row=5, column=0, sticky="w", padx=6, pady=4)
+        self.target_var = tk.StringVar(value="")
+        ttk.Entry(opt, textvariable=self.target_var, width=8).grid(row=5, column=1, sticky="w", padx=6, pady=4)
+        ttk.Button(opt, text="Fit WPM to Target", command=self.on_fit_target).grid(row=5, column=2, sticky="w", padx=6, pady=4)
+
+        # Only takes effect where pynput presses Shift per character (Linux uinput)
+        self.shift_runs_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(opt, text="Hold Shift across capitals", variable=self.shift_runs_var).grid(row=5, column=3, sticky="w", padx=6, pady=4)
+
+        # Buttons
+        btns = ttk.Frame(root)
+        btns.pack(fill="x", pady=8)
+        self.start_btn = ttk.Button(btns, text="Start Typing (3s)", command=self.on_start)
+        self.start_btn.pack(side="left", padx=6)
+        self.pause_btn = ttk.Button(btns, text="Pause", command=self.on_pause, state="disabled")
+        self.pause_btn.pack(side="left", padx=6)
+        self.stop_btn = ttk.Button(btns, text="Stop", command=self.on_stop, state="disabled")
+        self.stop_btn.pack(side="left", padx=6)
+        ttk.Button(btns, text="Preview Plan", command=self.on_preview).pack(side="left", padx=6)
+
+        # Status
+        self.status = tk.StringVar(value="Ready.")
+        ttk.Label(root, textvariable=self.status).pack(anchor="w")
+
+        # Footer
+        tip = ("Tip: After clicking Start, immediately click into your target window (Google Docs, Word, etc.). "
+               "Grant Accessibility permissions on macOS (System Settings → Privacy & Security → Accessibility).")
+        ttk.Label(root, text=tip, wraplength=780, foreground="#555").pack(anchor="w", pady=(8,0))
+
+    def apply_preset(self, *_):
+        name = self.preset.get()
+        conf = PERSONALITIES.get(name, {})
+        # Update UI values
+        self.min_wpm_var.set(str(conf.get('min_wpm', self.settings.min_wpm)))
+        self.max_wpm_var.set(str(conf.get('max_wpm', self.settings.max_wpm)))
+        self.letter_typo_var.set(str(int(conf.get('letter_typo_rate', self.settings.letter_typo_rate)*100)))
+        self.punct_typo_var.set(str(int(conf.get('punct_typo_rate', self.settings.punct_typo_rate)*100)))
+        self.think_var.set(str(int(conf.get('think_pause_chance', self.settings.think_pause_chance)*100)))
+        self.jitter_var.set(str(int(conf.get('jitter_std', self.settings.jitter_std)*100)))
+
+    def _read_settings(self) -> Settings:
+        try:
+            min_wpm = float(self.min_wpm_var.get())
+            max_wpm = float(self.max_wpm_var.get())
+            ltr = float(self.letter_typo_var.get()) / 100.0
+            ptr = float(self.punct_typo_var.get()) / 100.0
+            think = float(self.think_var.get()) / 100.0
+            jit = float(self.jitter_var.get()) / 100.0
+        except ValueError:
+            messagebox.showerror("Invalid settings", "Please enter numeric values for WPM and percentages.")
+            raise
+
+        if min_wpm <= 0 or max_wpm < min_wpm:
+            messagebox.showerror("Invalid WPM", "Ensure Min WPM > 0 and Max WPM ≥ Min WPM.")
+            raise ValueError("Bad WPM range")
+
+        s = Settings(
+            min_wpm=min_wpm,
+            max_wpm=max_wpm,
+            letter_typo_rate=ltr,
+            punct_typo_rate=ptr,
+            enable_corrections=self.corr_var.get(),
+            micro_pauses=self.pause_var.get(),
+            think_pause_chance=think,
+            jitter_std=jit
+        )
+        return s
+
+    def post_status(self, msg: str):
+        # Safe from any thread and never blocks: Tk is only touched in _drain_status
+        self._status_queue.put(msg)
+
+    def post_call(self, fn, *args):
+        # Run fn(*args) on the Tk thread; safe from any thread
+        self._call_queue.put((fn, args))
+
+    def _drain_status(self):
+        # Reschedule even if a posted call raises, or updates stop for good
+        try:
+            try:
+                while True:
+                    fn, args = self._call_queue.get_nowait()
+                    fn(*args)
+            except queue.Empty:
+                pass
+            # Only the newest message matters; skip the ones it supersedes
+            latest = None
+            try:
+                while True:
+                    latest = self._status_queue.get_nowait()
+            except queue.Empty:
+                pass
+            if latest is not None and latest != self.status.get():
+                self.status.set(latest)
+        finally:
+            self.after(STATUS_INTERVAL_MS, self._drain_status)
+
+    def on_preview(self):
+        # Light-weight preview: show a few sampled delays/typos likelihoods
+        try:
+            s = self._read_settings()
+        except Exception:
+            return
+
+        sample_wpm = [round(random.uniform(s.min_wpm, s.max_wpm), 1) for _ in range(5)]
+        delays = [round(secs_per_char_for_wpm(w), 3) for w in sample_wpm]
+        e = estimate(self.textbox.get("1.0", "end-1c"), s)
+        minutes, seconds = divmod(round(e.duration), 60)
+        preview = (f"Estimated time: {minutes}m {seconds:02d}s for {e.chars:,} characters\n"
+                   f"Expected keystrokes: {e.keystrokes:,.0f} ({e.backspaces:,.0f} backspaces, "
+                   f"{e.typos:,.0f} corrections, {e.pauses:,.0f} pauses)\n"
+                   f"Sample WPMs: {sample_wpm}\n"
+                   f"Base char delays (s): {delays}\n"
+                   f"Letter typo rate: {int(s.letter_typo_rate*100)}%\n"
+                   f"Punctuation typo rate: {int(s.punct_typo_rate*100)}%\n"
+                   f"Think pause chance: {int(s.think_pause_chance*100)}%\n"
+                   f"Corrections: {'on' if s.enable_corrections else 'off'} • Micro-pauses: {'on' if s.micro_pauses else 'off'}")
+        messagebox.showinfo("Preview", preview)
+
+    def on_fit_target(self):
+        try:
+            s = self._read_settings()
+        except Exception:
+            return
+        try:
+            minutes = float(self.target_var.get())
+        except ValueError:
+            messagebox.showerror("Invalid target", "Please enter the target time in minutes.")
+            return
+        text = self.textbox.get("1.0", "end-1c")
+        try:
+            fitted = settings_for_duration(text, s, minutes * 60)
+        except ValueError as e:
+            messagebox.showerror("Target out of reach", str(e))
+            return
+        self.min_wpm_var.set(f"{fitted.min_wpm:.1f}")
+        self.max_wpm_var.set(f"{fitted.max_wpm:.1f}")
+        self.post_status(f"WPM range set to {fitted.min_wpm:.1f}-{fitted.max_wpm:.1f} "
+                         f"for about {minutes:g} min.")
+
+    def on_start(self):
+        text = self.textbox.get("1.0", "end-1c")
+        if not text.strip():
+            messagebox.showwarning("Empty text", "Please paste some text to type.")
+            return
+
+        # Ensure dependency
+        if not load_pynput():
+            messagebox.showerror("Missing dependency",
+                                 "The 'pynput' package is required.\n\nInstall with:\n    pip install pynput")
+            return
+
+        try:
+            self.settings = self._read_settings()
+        except Exception:
+            return
+
+        options = {} if self.shift_runs_var.get() else {"shift_runs": False}
+        process = self.process_var.get()
+        self.typer = HumanTyper(self.settings, ui_callback=self.post_status,
+                                backend=None if process else PynputBackend(**options),
+                                process_backend="pynput" if process else None,
+                                backend_options=options)
+        self.start_btn.configure(state="disabled")
+        self.stop_btn.configure(state="normal")
+        # Pausing needs the in-process executor
+        self.pause_btn.configure(text="Pause",
+                                 state="disabled" if self.process_var.get() else "normal")
+        self.post_status("Prepare target window. Typing starts after countdown...")
+        job = self.typer.start(text, countdown=3)
+        job.add_done_callback(lambda job: self.post_call(self.on_finished, job))
+
+    def on_finished(self, job):
+        if job.typer is not self.typer:
+            return  # a newer run owns the buttons
+        self.start_btn.configure(state="normal")
+        self.stop_btn.configure(state="disabled")
+        self.pause_btn.configure(text="Pause", state="disabled")
+        error = job.exception()
+        if error is not None:
+            self.post_status("Typing failed.")
+            messagebox.showerror("Typing failed", str(error))
+            return
+        report = job.result()
+        if report.stopped:
+            return
+        self.post_status(f"Done: {report.keystrokes} keystrokes in {report.duration:.1f}s "
+                         f"({report.achieved_wpm:.0f} WPM).")
+
+    def on_pause(self):
+        if not self.typer:
+            return
+        if self.typer.paused:
+            self.typer.resume()
+            self.pause_btn.configure(text="Pause")
+        else:
+            self.typer.pause()
+            self.pause_btn.configure(text="Resume")
+
+    def on_stop(self):
+        if self.typer:
+            self.typer.stop()
+        self.start_btn.configure(state="normal")
+        self.stop_btn.configure(state="disabled")
+        self.pause_btn.configure(text="Pause", state="disabled")
+        self.post_status("Stopped by user.")
+
+def main():
+    app = App()
+    app.mainloop()
+
+if __name__ == "__main__":
+    main()